@@ -12,6 +12,7 @@ synchronous ``tool.invoke()`` call inside agent nodes.
 """
 
 import base64
+import functools
 from typing import Dict, Any, List
 
 import httpx
@@ -20,11 +21,16 @@ from langchain_core.tools import tool
 from shared.config import settings
 
 
+@functools.lru_cache(maxsize=4)
+def _encode_basic_auth(email: str, api_token: str) -> str:
+    """Encode ``email:api_token`` once per credential pair."""
+    encoded = base64.b64encode(f"{email}:{api_token}".encode()).decode()
+    return f"Basic {encoded}"
+
+
 def _basic_auth_header() -> str:
     """Return a Basic auth header value for Jira Cloud REST API v3."""
-    credentials = f"{settings.jira_email}:{settings.jira_api_token}"
-    encoded = base64.b64encode(credentials.encode()).decode()
-    return f"Basic {encoded}"
+    return _encode_basic_auth(settings.jira_email, settings.jira_api_token)
 
 
 def _jira_headers() -> Dict[str, str]:
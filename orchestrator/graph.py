@@ -12,10 +12,12 @@ Graph flow
 """
 
 import importlib
+import os
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Literal, Optional
 from typing_extensions import TypedDict
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import AzureChatOpenAI
 from langgraph.graph import StateGraph, END
 from orchestrator.supervisor import classifier
 from orchestrator.verifier import verifier
@@ -316,6 +318,20 @@ def respond_node(state: OrchestratorState) -> OrchestratorState:
     return state
 
 
+def _template_handoff_summary(
+    query: str,
+    verification: Dict[str, Any],
+    specialist_responses: List[Dict[str, Any]],
+) -> str:
+    """Plain-text handoff summary used when the LLM is disabled or fails."""
+    return (
+        f"CUSTOMER ISSUE: {query}\n"
+        f"AGENTS TRIED: {', '.join(r.get('agent','?') for r in specialist_responses) or 'none'}\n"
+        f"VERIFIER NOTES: {verification.get('critique', 'Low confidence')}\n"
+        f"ACTION: Manual review required"
+    )
+
+
 def summarize_node(state: OrchestratorState) -> OrchestratorState:
     """
     Generate a structured AI-powered handoff summary before escalation.
@@ -325,15 +341,21 @@ def summarize_node(state: OrchestratorState) -> OrchestratorState:
 
     The summary is stored in ``state['handoff_summary']`` and is included in
     the escalation payload returned to the caller.
-    Falls back to a plain-text template if the LLM call fails.
+    Falls back to a plain-text template if the LLM call fails, or straight away
+    when ``ORCHESTRATOR_DISABLE_LLM=1`` (used by tests and offline runs).
     """
     query = state["message"]
     verification = state.get("verification", {})
     specialist_responses = state.get("specialist_responses", [])
 
-    try:
-        from langchain_openai import AzureChatOpenAI
+    if os.environ.get("ORCHESTRATOR_DISABLE_LLM") == "1":
+        state["handoff_summary"] = _template_handoff_summary(
+            query, verification, specialist_responses
+        )
+        print("Handoff summary generated.")
+        return state
 
+    try:
         llm = AzureChatOpenAI(
             azure_endpoint=settings.azure_openai_endpoint,
             api_key=settings.azure_openai_api_key,
@@ -369,11 +391,8 @@ def summarize_node(state: OrchestratorState) -> OrchestratorState:
     except Exception as exc:
         # Fallback: use the structured string from escalator
         print(f"Summarize LLM call failed, using template fallback: {exc}")
-        state["handoff_summary"] = (
-            f"CUSTOMER ISSUE: {query}\n"
-            f"AGENTS TRIED: {', '.join(r.get('agent','?') for r in specialist_responses) or 'none'}\n"
-            f"VERIFIER NOTES: {verification.get('critique', 'Low confidence')}\n"
-            f"ACTION: Manual review required"
+        state["handoff_summary"] = _template_handoff_summary(
+            query, verification, specialist_responses
         )
 
     print("Handoff summary generated.")
@@ -2,11 +2,39 @@
 Verifier agent for confidence scoring and fact-checking.
 """
 
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from langchain_openai import AzureChatOpenAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage
 from shared.config import settings
 
+# The verifier's instructions never change, so one message object is shared
+# by every verify() call instead of being rebuilt per request.
+_SYSTEM_MESSAGE = SystemMessage(
+    content="""You are a verification agent that checks responses for accuracy and completeness.
+Your job is to:
+1. Check if the response is grounded in the provided sources
+2. Identify any potential hallucinations or unsupported claims
+3. Assess if the response fully addresses the user's query
+4. Consider tool results and ensure they're properly incorporated
+5. Compute a final confidence score
+
+Scoring guidelines:
+- 0.9-1.0: Fully grounded, complete answer with strong supporting evidence
+- 0.7-0.89: Good answer with minor gaps or slight uncertainty
+- 0.5-0.69: Partial answer or moderate uncertainty
+- 0.3-0.49: Significant gaps or low confidence
+- 0.0-0.29: Unsupported or likely incorrect
+
+Provide your assessment in this format:
+GROUNDED: yes/no/partial
+COMPLETE: yes/no/partial
+CONCERNS: list any issues
+FINAL_CONFIDENCE: 0.XX
+CRITIQUE: brief explanation"""
+)
+
 
 class VerifierAgent:
     """
@@ -14,15 +42,22 @@ class VerifierAgent:
     Performs grounding checks and self-critique.
     """
 
-    def __init__(self):
-        """Initialize verifier with LLM."""
-        self.llm = AzureChatOpenAI(
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_key=settings.azure_openai_api_key,
-            api_version=settings.azure_openai_api_version,
-            deployment_name=settings.azure_openai_deployment_gpt4,
-            temperature=0.0,
-        )
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        """
+        Initialize verifier with LLM.
+
+        Args:
+            llm: Chat model to verify with; defaults to the Azure GPT-4 deployment
+        """
+        if llm is None:
+            llm = AzureChatOpenAI(
+                azure_endpoint=settings.azure_openai_endpoint,
+                api_key=settings.azure_openai_api_key,
+                api_version=settings.azure_openai_api_version,
+                deployment_name=settings.azure_openai_deployment_gpt4,
+                temperature=0.0,
+            )
+        self.llm = llm
 
     def verify(
         self,
@@ -51,28 +86,6 @@ class VerifierAgent:
             self._format_tools(tool_results) if tool_results else "No tools used"
         )
 
-        system_prompt = """You are a verification agent that checks responses for accuracy and completeness.
-Your job is to:
-1. Check if the response is grounded in the provided sources
-2. Identify any potential hallucinations or unsupported claims
-3. Assess if the response fully addresses the user's query
-4. Consider tool results and ensure they're properly incorporated
-5. Compute a final confidence score
-
-Scoring guidelines:
-- 0.9-1.0: Fully grounded, complete answer with strong supporting evidence
-- 0.7-0.89: Good answer with minor gaps or slight uncertainty
-- 0.5-0.69: Partial answer or moderate uncertainty
-- 0.3-0.49: Significant gaps or low confidence
-- 0.0-0.29: Unsupported or likely incorrect
-
-Provide your assessment in this format:
-GROUNDED: yes/no/partial
-COMPLETE: yes/no/partial
-CONCERNS: list any issues
-FINAL_CONFIDENCE: 0.XX
-CRITIQUE: brief explanation"""
-
         user_message = f"""User Query: {query}
 
 Agent Response: {response}
@@ -88,7 +101,7 @@ Agent's Self-Reported Confidence: {agent_confidence}
 Verify this response and provide your assessment."""
 
         messages = [
-            SystemMessage(content=system_prompt),
+            _SYSTEM_MESSAGE,
             HumanMessage(content=user_message),
         ]
 
@@ -125,49 +138,73 @@ Verify this response and provide your assessment."""
         self, verification_text: str, agent_confidence: float
     ) -> Dict[str, Any]:
         """Parse verifier response."""
+        grounded, complete, concerns, final_confidence, critique = (
+            _parse_verification_fields(verification_text, agent_confidence)
+        )
         result = {
-            "grounded": "partial",
-            "complete": "partial",
-            "concerns": [],
-            "final_confidence": agent_confidence,  # Default to agent's confidence
-            "critique": "",
-            "should_escalate": False,
+            "grounded": grounded,
+            "complete": complete,
+            "concerns": list(concerns),
+            "final_confidence": final_confidence,
+            "critique": critique,
         }
 
-        lines = verification_text.strip().split("\n")
+        # Determine if should escalate
+        result["should_escalate"] = (
+            final_confidence < settings.confidence_threshold
+            or grounded == "no"
+            or len(concerns) > 2
+        )
 
-        for line in lines:
-            line = line.strip()
+        return result
 
-            if line.startswith("GROUNDED:"):
-                result["grounded"] = line.split(":", 1)[1].strip().lower()
 
-            elif line.startswith("COMPLETE:"):
-                result["complete"] = line.split(":", 1)[1].strip().lower()
+# One "KEY: value" line of the verifier's output; leading indentation is allowed.
+_VERIFICATION_LINE_RE = re.compile(
+    r"^[^\S\n]*(GROUNDED|COMPLETE|CONCERNS|FINAL_CONFIDENCE|CRITIQUE):(.*)$",
+    re.MULTILINE,
+)
 
-            elif line.startswith("CONCERNS:"):
-                concerns = line.split(":", 1)[1].strip()
-                if concerns and concerns.lower() not in ["none", "n/a"]:
-                    result["concerns"] = [c.strip() for c in concerns.split(",")]
 
-            elif line.startswith("FINAL_CONFIDENCE:"):
-                try:
-                    conf = float(line.split(":", 1)[1].strip())
-                    result["final_confidence"] = conf
-                except:
-                    pass
+def _parse_verification_fields(
+    verification_text: str, agent_confidence: float
+) -> Tuple[str, str, Tuple[str, ...], float, str]:
+    """
+    Parse verifier key/value lines into their fields.
 
-            elif line.startswith("CRITIQUE:"):
-                result["critique"] = line.split(":", 1)[1].strip()
+    Returns (grounded, complete, concerns, final_confidence, critique);
+    escalation is left to the caller because it depends on the configured
+    threshold.
+    """
+    grounded = "partial"
+    complete = "partial"
+    concerns: Tuple[str, ...] = ()
+    final_confidence = agent_confidence  # Default to agent's confidence
+    critique = ""
 
-        # Determine if should escalate
-        result["should_escalate"] = (
-            result["final_confidence"] < settings.confidence_threshold
-            or result["grounded"] == "no"
-            or len(result["concerns"]) > 2
-        )
+    for match in _VERIFICATION_LINE_RE.finditer(verification_text):
+        key, value = match.group(1), match.group(2).strip()
 
-        return result
+        if key == "GROUNDED":
+            grounded = value.lower()
+
+        elif key == "COMPLETE":
+            complete = value.lower()
+
+        elif key == "CONCERNS":
+            if value and value.lower() not in ["none", "n/a"]:
+                concerns = tuple(c.strip() for c in value.split(","))
+
+        elif key == "FINAL_CONFIDENCE":
+            try:
+                final_confidence = float(value)
+            except:
+                pass
+
+        else:  # CRITIQUE
+            critique = value
+
+    return grounded, complete, concerns, final_confidence, critique
 
 
 # Global verifier instance
@@ -213,21 +213,21 @@ def test_health_check():
 async def test_webhook_invalid_signature():
     """Returns 403 when HMAC signature fails validation."""
     from function_app import webhook_trigger
+    from integrations.intercom import validate_webhook_signature
 
-    payload = json.dumps(
-        {"topic": "conversation.user.replied", "data": {"item": {}}}
-    ).encode()
+    payload = b'{"test":"data"}'
+    assert not validate_webhook_signature(payload, "sha256=invalid", "test-secret")
 
-    with patch("integrations.intercom.validate_webhook_signature", return_value=False):
-        req = func.HttpRequest(
-            method="POST",
-            url="https://localhost/api/webhook",
-            headers={"X-Hub-Signature-256": "sha256=invalid"},
-            params={},
-            route_params={},
-            body=payload,
-        )
-        resp = await webhook_trigger(req)
+    # Drive the handler directly with the real validator — no HTTP stack involved.
+    req = func.HttpRequest(
+        method="POST",
+        url="https://localhost/api/webhook",
+        headers={"X-Hub-Signature-256": "sha256=invalid"},
+        params={},
+        route_params={},
+        body=payload,
+    )
+    resp = await webhook_trigger(req)
 
     assert resp.status_code == 403
 
@@ -96,101 +96,91 @@ class TestRouteToSpecialistsNode:
         }
         return mock_agent
 
-    def test_single_agent_invoked(self):
-        from orchestrator.graph import route_to_specialists_node
+    @pytest.fixture
+    def import_module_kwargs(self, request):
+        """Build ``importlib.import_module`` patch kwargs from ``(topic, outcome)``.
 
-        mock_agent = self._mock_agent("Invoice looks correct.")
+        ``outcome`` is either the agent's response text or an exception the
+        import should raise.
+        """
+        topic, outcome = request.param
+        if isinstance(outcome, Exception):
+            return {"side_effect": outcome}
         mock_module = MagicMock()
-        mock_module.billing_agent = mock_agent
-
-        mock_classifier = MagicMock()
-        mock_classifier.get_agent_configs.return_value = [
-            {
-                "topic": "billing",
-                "module": "agents.billing_agent",
-                "agent_name": "billing_agent",
-            }
-        ]
-
-        with (
-            patch("orchestrator.graph.classifier", mock_classifier),
-            patch(
-                "orchestrator.graph.importlib.import_module", return_value=mock_module
-            ),
-        ):
-            state = _minimal_state(
-                classification={
+        setattr(mock_module, f"{topic}_agent", self._mock_agent(outcome))
+        return {"return_value": mock_module}
+
+    @pytest.mark.parametrize(
+        "import_module_kwargs, classification, expected_topics, expected_response, expected_confidence",
+        [
+            pytest.param(
+                ("billing", "Invoice looks correct."),
+                {
                     "primary_topic": "billing",
                     "all_topics": [{"topic": "billing", "confidence": 0.9}],
-                }
-            )
-            result = route_to_specialists_node(state)
-
-        assert len(result["specialist_responses"]) == 1
-        assert result["specialist_responses"][0]["agent"] == "billing"
-        assert result["specialist_responses"][0]["response"] == "Invoice looks correct."
-
-    def test_agent_exception_adds_error_response(self):
-        """If an agent module fails to load, an error entry is added — not raised."""
-        from orchestrator.graph import route_to_specialists_node
-
-        mock_classifier = MagicMock()
-        mock_classifier.get_agent_configs.return_value = [
-            {
-                "topic": "technical",
-                "module": "agents.technical_agent",
-                "agent_name": "technical_agent",
-            }
-        ]
-
-        with (
-            patch("orchestrator.graph.classifier", mock_classifier),
-            patch(
-                "orchestrator.graph.importlib.import_module",
-                side_effect=ImportError("agent not found"),
+                },
+                ["billing"],
+                "Invoice looks correct.",
+                0.9,
+                id="single_agent_invoked",
             ),
-        ):
-            state = _minimal_state(
-                classification={
+            # If an agent module fails to load, an error entry is added — not raised.
+            pytest.param(
+                ("technical", ImportError("agent not found")),
+                {
                     "primary_topic": "technical",
                     "all_topics": [{"topic": "technical", "confidence": 0.8}],
-                }
-            )
-            result = route_to_specialists_node(state)
-
-        assert len(result["specialist_responses"]) == 1
-        assert result["specialist_responses"][0]["confidence"] == 0.0
-        assert "Error" in result["specialist_responses"][0]["response"]
-
-    def test_fallback_to_primary_topic_when_no_all_topics(self):
-        """When all_topics is empty, primary_topic is used as the only topic."""
+                },
+                ["technical"],
+                "Error: Unable to process with technical agent",
+                0.0,
+                id="agent_exception_adds_error_response",
+            ),
+            # When all_topics is empty, primary_topic is used as the only topic.
+            pytest.param(
+                ("returns", "Here is your answer."),
+                {"primary_topic": "returns", "all_topics": []},
+                ["returns"],
+                "Here is your answer.",
+                0.9,
+                id="fallback_to_primary_topic_when_no_all_topics",
+            ),
+        ],
+        indirect=["import_module_kwargs"],
+    )
+    def test_route_to_specialists(
+        self,
+        import_module_kwargs,
+        classification,
+        expected_topics,
+        expected_response,
+        expected_confidence,
+    ):
         from orchestrator.graph import route_to_specialists_node
 
-        mock_agent = self._mock_agent()
-        mock_module = MagicMock()
-        mock_module.returns_agent = mock_agent
-
+        topic = expected_topics[0]
         mock_classifier = MagicMock()
         mock_classifier.get_agent_configs.return_value = [
             {
-                "topic": "returns",
-                "module": "agents.returns_agent",
-                "agent_name": "returns_agent",
+                "topic": topic,
+                "module": f"agents.{topic}_agent",
+                "agent_name": f"{topic}_agent",
             }
         ]
 
         with (
             patch("orchestrator.graph.classifier", mock_classifier),
-            patch(
-                "orchestrator.graph.importlib.import_module", return_value=mock_module
-            ),
+            patch("orchestrator.graph.importlib.import_module", **import_module_kwargs),
         ):
-            state = _minimal_state(
-                classification={"primary_topic": "returns", "all_topics": []}
-            )
-            route_to_specialists_node(state)
+            state = _minimal_state(classification=classification)
+            result = route_to_specialists_node(state)
 
-        mock_classifier.get_agent_configs.assert_called_once_with(["returns"])
+        mock_classifier.get_agent_configs.assert_called_once_with(expected_topics)
+        assert len(result["specialist_responses"]) == 1
+        response = result["specialist_responses"][0]
+        assert response["agent"] == topic
+        assert response["response"] == expected_response
+        assert response["confidence"] == expected_confidence
 
 
 # ---------------------------------------------------------------------------
@@ -359,8 +349,8 @@ class TestRespondNode:
 
 
 class TestSummarizeNode:
-    def test_llm_path_sets_handoff_summary(self):
-        from orchestrator.graph import summarize_node
+    def test_llm_path_sets_handoff_summary(self, monkeypatch):
+        import orchestrator.graph as gmod
 
         mock_response = MagicMock()
         mock_response.content = (
@@ -371,25 +361,20 @@ class TestSummarizeNode:
         mock_llm.invoke.return_value = mock_response
 
         mock_llm_cls = MagicMock(return_value=mock_llm)
+        monkeypatch.setattr(gmod, "AzureChatOpenAI", mock_llm_cls)
+
+        state = _minimal_state(
+            specialist_responses=[{"agent": "billing", "confidence": 0.4}],
+            verification={"critique": "Low confidence"},
+        )
+        result = gmod.summarize_node(state)
 
-        with patch("orchestrator.graph.AzureChatOpenAI", mock_llm_cls, create=True):
-            # Patch the import inside the function
-            with patch.dict(
-                "sys.modules",
-                {"langchain_openai": MagicMock(AzureChatOpenAI=mock_llm_cls)},
-            ):
-                state = _minimal_state(
-                    specialist_responses=[{"agent": "billing", "confidence": 0.4}],
-                    verification={"critique": "Low confidence"},
-                )
-                # Directly inject the mock into the module
-                import orchestrator.graph as gmod
-
-                with patch.object(gmod, "AzureChatOpenAI", mock_llm_cls, create=True):
-                    result = summarize_node(state)
-
-        # Either the LLM succeeded and set the summary, or it fell back — both are valid
-        assert result["handoff_summary"] != ""
+        mock_llm_cls.assert_called_once()
+        mock_llm.invoke.assert_called_once()
+        assert "billing dispute" in result["handoff_summary"]
+        assert result["handoff_summary"] == (
+            "Customer has billing dispute. Tried billing agent. Needs human."
+        )
 
     def test_fallback_when_llm_raises(self):
         """When AzureChatOpenAI raises (e.g. no credentials), fallback template is used."""
@@ -397,10 +382,10 @@ class TestSummarizeNode:
 
         import orchestrator.graph as gmod
 
-        # Make AzureChatOpenAI raise on construction — but only if it exists in the module
+        # Make AzureChatOpenAI raise on construction
         mock_llm_cls = MagicMock(side_effect=RuntimeError("no credentials"))
 
-        with patch.object(gmod, "AzureChatOpenAI", mock_llm_cls, create=True):
+        with patch.object(gmod, "AzureChatOpenAI", mock_llm_cls):
             state = _minimal_state(
                 message="I keep getting charged twice",
                 specialist_responses=[{"agent": "billing", "confidence": 0.3}],
@@ -411,20 +396,23 @@ class TestSummarizeNode:
         assert "CUSTOMER ISSUE" in result["handoff_summary"]
         assert "I keep getting charged twice" in result["handoff_summary"]
 
-    def test_fallback_always_sets_nonempty_summary(self):
+    def test_fallback_always_sets_nonempty_summary(self, monkeypatch):
         """
         Even with no specialist responses the fallback must produce a non-empty summary.
-        In practice the LLM import will fail in CI (no Azure OAI creds) so we always
-        hit the fallback — confirm it is non-empty.
+        ORCHESTRATOR_DISABLE_LLM short-circuits to the fallback without touching Azure.
         """
-        from orchestrator.graph import summarize_node
+        import orchestrator.graph as gmod
+
+        mock_llm_cls = MagicMock()
+        monkeypatch.setattr(gmod, "AzureChatOpenAI", mock_llm_cls)
+        monkeypatch.setenv("ORCHESTRATOR_DISABLE_LLM", "1")
 
         state = _minimal_state(specialist_responses=[], verification={})
-        result = summarize_node(state)
+        result = gmod.summarize_node(state)
 
-        # Whether LLM or fallback ran, summary must be populated
-        assert isinstance(result["handoff_summary"], str)
-        assert len(result["handoff_summary"]) > 0
+        mock_llm_cls.assert_not_called()
+        assert "CUSTOMER ISSUE" in result["handoff_summary"]
+        assert "AGENTS TRIED: none" in result["handoff_summary"]
 
 
 # ---------------------------------------------------------------------------
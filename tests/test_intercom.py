@@ -9,49 +9,55 @@ import hashlib
 import hmac
 import json
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+import pytest_asyncio
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
 from httpx import AsyncClient, ASGITransport
 
+from integrations import intercom
+from integrations.intercom import (
+    add_note_to_intercom,
+    app,
+    get_conversation_from_intercom,
+    post_reply_to_intercom,
+    validate_webhook_signature,
+)
+from shared.config import settings
+
 # ---------------------------------------------------------------------------
 # validate_webhook_signature (pure function)
 # ---------------------------------------------------------------------------
 
-
-class TestValidateWebhookSignature:
-    def _fn(self, body: bytes, signature: str, secret: str) -> bool:
-        from integrations.intercom import validate_webhook_signature
-
-        return validate_webhook_signature(body, signature, secret)
-
-    def _make_sig(self, body: bytes, secret: str) -> str:
-        return (
-            "sha256="
-            + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
-        )
-
-    def test_valid_signature_returns_true(self):
-        body = b'{"topic":"test"}'
-        secret = "my-webhook-secret"
-        sig = self._make_sig(body, secret)
-        assert self._fn(body, sig, secret) is True
-
-    def test_invalid_signature_returns_false(self):
-        body = b'{"topic":"test"}'
-        assert self._fn(body, "sha256=badhash", "secret") is False
-
-    def test_empty_signature_returns_false(self):
-        assert self._fn(b"body", "", "secret") is False
-
-    def test_empty_secret_returns_false(self):
-        assert self._fn(b"body", "sha256=anything", "") is False
-
-    def test_raw_hex_without_prefix(self):
-        """Raw HMAC hex (no sha256= prefix) is compared verbatim."""
-        body = b"data"
-        secret = "sec"
-        raw_hex = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
-        # Without the prefix the code doesn't strip, so compare raw_hex vs raw_hex succeeds
-        assert self._fn(body, raw_hex, secret) is True
+# Well-formed (64 hex chars) but wrong, so compare_digest does a full-length compare.
+_BAD_SIG = "sha256=" + "0" * 64
+_GOOD_SIG_FOR_TOPIC_TEST = (
+    "sha256=" + hmac.digest(b"my-webhook-secret", b'{"topic":"test"}', "sha256").hex()
+)
+_RAW_HEX_FOR_DATA = hmac.digest(b"sec", b"data", "sha256").hex()
+
+
+@pytest.mark.parametrize(
+    "body, sig, secret, expected",
+    [
+        pytest.param(
+            b'{"topic":"test"}',
+            _GOOD_SIG_FOR_TOPIC_TEST,
+            "my-webhook-secret",
+            True,
+            id="valid_signature",
+        ),
+        pytest.param(b'{"topic":"test"}', _BAD_SIG, "secret", False, id="invalid"),
+        pytest.param(b"body", "", "secret", False, id="empty_signature"),
+        pytest.param(b"body", "sha256=anything", "", False, id="empty_secret"),
+        # Raw HMAC hex (no sha256= prefix) is compared verbatim.
+        pytest.param(b"data", _RAW_HEX_FOR_DATA, "sec", True, id="raw_hex_no_prefix"),
+    ],
+)
+def test_validate_webhook_signature(body, sig, secret, expected):
+    assert validate_webhook_signature(body, sig, secret) is expected
 
 
 # ---------------------------------------------------------------------------
@@ -59,7 +65,7 @@ class TestValidateWebhookSignature:
 # ---------------------------------------------------------------------------
 
 
-def _make_webhook_payload(topic: str = "conversation.user.replied") -> bytes:
+def _encode_webhook_payload(topic: str) -> bytes:
     payload = {
         "topic": topic,
         "data": {
@@ -73,153 +79,119 @@ def _make_webhook_payload(topic: str = "conversation.user.replied") -> bytes:
     return json.dumps(payload).encode()
 
 
-def _valid_sig(body: bytes, secret: str = "test-webhook-secret") -> str:
-    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
-
-
-# ---------------------------------------------------------------------------
-# /webhook endpoint
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_webhook_invalid_signature_returns_403():
-    from integrations.intercom import app
-    from shared.config import settings
-
-    with patch.object(settings, "intercom_webhook_secret", "real-secret"):
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.post(
-                "/webhook",
-                content=b'{"topic":"test"}',
-                headers={"X-Hub-Signature-256": "sha256=badsig"},
-            )
-
-    assert response.status_code == 403
-
+_SECRET = "sec"
 
-@pytest.mark.asyncio
-async def test_webhook_invalid_json_returns_400():
-    from integrations.intercom import app
-    from shared.config import settings
+# Webhook payloads and their signatures are static, so build them once at import.
+_PAYLOAD_USER_REPLIED = _encode_webhook_payload("conversation.user.replied")
+_PAYLOAD_ADMIN = _encode_webhook_payload("conversation.admin.replied")
+_SIG_USER = (
+    "sha256=" + hmac.digest(_SECRET.encode(), _PAYLOAD_USER_REPLIED, "sha256").hex()
+)
+_SIG_ADMIN = "sha256=" + hmac.digest(_SECRET.encode(), _PAYLOAD_ADMIN, "sha256").hex()
 
-    body = b"not valid json"
 
-    with patch.object(settings, "intercom_webhook_secret", "sec"):
-        sig = _valid_sig(body, "sec")
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.post(
-                "/webhook",
-                content=body,
-                headers={"X-Hub-Signature-256": sig},
-            )
-
-    assert response.status_code == 400
-
-
-@pytest.mark.asyncio
-async def test_webhook_non_conversation_topic_returns_ok():
-    """Topics other than conversation.user.* return 200 without running orchestrator."""
-    from integrations.intercom import app
-    from shared.config import settings
-
-    body = _make_webhook_payload(topic="conversation.admin.replied")
-
-    with patch.object(settings, "intercom_webhook_secret", "sec"):
-        sig = _valid_sig(body, "sec")
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.post(
-                "/webhook",
-                content=body,
-                headers={"X-Hub-Signature-256": sig},
-            )
-
-    assert response.status_code == 200
-    assert response.json()["status"] == "ok"
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client():
+    """One ASGI transport + AsyncClient shared by every endpoint test in the module."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
 
 
-@pytest.mark.asyncio
-async def test_webhook_conversation_user_replied_runs_orchestrator():
-    from integrations.intercom import app
-    from shared.config import settings
-
-    body = _make_webhook_payload("conversation.user.replied")
-
-    mock_result = {
-        "status": "success",
-        "message": "Here is the answer",
-        "confidence": 0.95,
-        "admin_id": None,
-    }
+# ---------------------------------------------------------------------------
+# /webhook endpoint
+# ---------------------------------------------------------------------------
 
-    with (
-        patch.object(settings, "intercom_webhook_secret", "sec"),
-        patch.object(settings, "confidence_threshold", 0.7),
-        patch(
-            "orchestrator.graph.run_aan_orchestrator",
-            new=AsyncMock(return_value=mock_result),
+_ORCHESTRATOR_SUCCESS = {
+    "status": "success",
+    "message": "Here is the answer",
+    "confidence": 0.95,
+    "admin_id": None,
+}
+_ORCHESTRATOR_ESCALATED = {
+    "status": "escalated",
+    "message": "Escalating to human",
+    "confidence": 0.3,
+    "escalation_summary": "Customer needs billing help",
+}
+
+
+@pytest.mark.parametrize(
+    "secret, body, sig, orchestrator_result, outbound, expected_status",
+    [
+        pytest.param(
+            "real-secret",
+            b'{"topic":"test"}',
+            _BAD_SIG,
+            None,
+            None,
+            403,
+            id="invalid_signature",
         ),
-        patch(
-            "integrations.intercom.post_reply_to_intercom",
-            new=AsyncMock(return_value={}),
+        pytest.param(
+            _SECRET,
+            b"not valid json",
+            "sha256="
+            + hmac.new(_SECRET.encode(), b"not valid json", hashlib.sha256).hexdigest(),
+            None,
+            None,
+            400,
+            id="invalid_json",
         ),
-    ):
-        sig = _valid_sig(body, "sec")
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.post(
-                "/webhook",
-                content=body,
-                headers={"X-Hub-Signature-256": sig},
-            )
-
-    assert response.status_code == 200
-
-
-@pytest.mark.asyncio
-async def test_webhook_escalated_posts_note():
-    from integrations.intercom import app
-    from shared.config import settings
-
-    body = _make_webhook_payload("conversation.user.replied")
-
-    mock_result = {
-        "status": "escalated",
-        "message": "Escalating to human",
-        "confidence": 0.3,
-        "escalation_summary": "Customer needs billing help",
-    }
-
-    with (
-        patch.object(settings, "intercom_webhook_secret", "sec"),
-        patch.object(settings, "confidence_threshold", 0.7),
-        patch(
-            "orchestrator.graph.run_aan_orchestrator",
-            new=AsyncMock(return_value=mock_result),
+        # Topics other than conversation.user.* return 200 without running orchestrator.
+        pytest.param(
+            _SECRET, _PAYLOAD_ADMIN, _SIG_ADMIN, None, None, 200, id="admin_topic"
         ),
-        patch(
-            "integrations.intercom.add_note_to_intercom",
-            new=AsyncMock(return_value={}),
+        pytest.param(
+            _SECRET,
+            _PAYLOAD_USER_REPLIED,
+            _SIG_USER,
+            _ORCHESTRATOR_SUCCESS,
+            "post_reply_to_intercom",
+            200,
+            id="user_replied_posts_reply",
         ),
-    ):
-        sig = _valid_sig(body, "sec")
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.post(
-                "/webhook",
-                content=body,
-                headers={"X-Hub-Signature-256": sig},
+        pytest.param(
+            _SECRET,
+            _PAYLOAD_USER_REPLIED,
+            _SIG_USER,
+            _ORCHESTRATOR_ESCALATED,
+            "add_note_to_intercom",
+            200,
+            id="escalated_posts_note",
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="module")
+async def test_webhook(
+    client, secret, body, sig, orchestrator_result, outbound, expected_status
+):
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(settings, "intercom_webhook_secret", secret))
+        stack.enter_context(patch.object(settings, "confidence_threshold", 0.7))
+        if orchestrator_result is not None:
+            stack.enter_context(
+                patch(
+                    "orchestrator.graph.run_aan_orchestrator",
+                    new=AsyncMock(return_value=orchestrator_result),
+                )
             )
+        outbound_mock = AsyncMock(return_value={})
+        if outbound is not None:
+            stack.enter_context(patch.object(intercom, outbound, new=outbound_mock))
+
+        response = await client.post(
+            "/webhook",
+            content=body,
+            headers={"X-Hub-Signature-256": sig},
+        )
 
-    assert response.status_code == 200
+    assert response.status_code == expected_status
+    if expected_status == 200:
+        assert response.json()["status"] == "ok"
+    if outbound is not None:
+        outbound_mock.assert_awaited_once()
 
 
 # ---------------------------------------------------------------------------
@@ -227,17 +199,12 @@ async def test_webhook_escalated_posts_note():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_data_connector_returns_formatted_response():
-    from integrations.intercom import app
-
-    payload = json.dumps(
-        {
-            "conversation_id": "conv-dc-1",
-            "query": "how do I export my data",
-            "context": {"user_id": "u-dc-1"},
-        }
-    ).encode()
+@pytest.mark.asyncio(loop_scope="module")
+async def test_data_connector_returns_formatted_response(client):
+    payload = (
+        b'{"conversation_id":"conv-dc-1","query":"how do I export my data",'
+        b'"context":{"user_id":"u-dc-1"}}'
+    )
 
     mock_result = {
         "message": "Go to Settings then Export.",
@@ -251,10 +218,7 @@ async def test_data_connector_returns_formatted_response():
         "orchestrator.graph.run_aan_orchestrator",
         new=AsyncMock(return_value=mock_result),
     ):
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.post("/data-connector", content=payload)
+        response = await client.post("/data-connector", content=payload)
 
     assert response.status_code == 200
     body = response.json()
@@ -264,25 +228,44 @@ async def test_data_connector_returns_formatted_response():
 
 
 # ---------------------------------------------------------------------------
-# post_reply_to_intercom
+# Outbound httpx.AsyncClient mock
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_post_reply_to_intercom_sends_correct_payload():
-    from integrations.intercom import post_reply_to_intercom
-
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"id": "reply-1"}
-    mock_response.raise_for_status = MagicMock()
+def make_mock_httpx_client(
+    method: str = "post", response_json: dict | None = None, side_effect=None
+) -> AsyncMock:
+    """Build an ``httpx.AsyncClient`` stand-in usable as an async context manager.
 
+    ``method`` (``"post"`` or ``"get"``) either returns a response whose
+    ``.json()`` is *response_json*, or raises *side_effect*.
+    """
     mock_client = AsyncMock()
     mock_client.__aenter__ = AsyncMock(return_value=mock_client)
     mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.post = AsyncMock(return_value=mock_response)
 
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        result = await post_reply_to_intercom("conv-1", "Hello, how can I help?")
+    if side_effect is not None:
+        setattr(mock_client, method, AsyncMock(side_effect=side_effect))
+    else:
+        response = SimpleNamespace(
+            json=lambda: response_json, raise_for_status=lambda: None
+        )
+        setattr(mock_client, method, AsyncMock(return_value=response))
+
+    return mock_client
+
+
+# ---------------------------------------------------------------------------
+# post_reply_to_intercom
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_post_reply_to_intercom_sends_correct_payload(monkeypatch):
+    mock_client = make_mock_httpx_client(response_json={"id": "reply-1"})
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
+
+    result = await post_reply_to_intercom("conv-1", "Hello, how can I help?")
 
     mock_client.post.assert_called_once()
     _, kwargs = mock_client.post.call_args
@@ -291,19 +274,15 @@ async def test_post_reply_to_intercom_sends_correct_payload():
     assert result == {"id": "reply-1"}
 
 
-@pytest.mark.asyncio
-async def test_post_reply_to_intercom_raises_on_http_error():
-    import httpx
-    from integrations.intercom import post_reply_to_intercom
-
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.post = AsyncMock(side_effect=httpx.HTTPError("connection refused"))
+@pytest.mark.asyncio(loop_scope="module")
+async def test_post_reply_to_intercom_raises_on_http_error(monkeypatch):
+    mock_client = make_mock_httpx_client(
+        side_effect=httpx.HTTPError("connection refused")
+    )
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
 
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        with pytest.raises(httpx.HTTPError):
-            await post_reply_to_intercom("conv-err", "msg")
+    with pytest.raises(httpx.HTTPError):
+        await post_reply_to_intercom("conv-err", "msg")
 
 
 # ---------------------------------------------------------------------------
@@ -311,21 +290,12 @@ async def test_post_reply_to_intercom_raises_on_http_error():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_add_note_to_intercom_sends_note_type():
-    from integrations.intercom import add_note_to_intercom
-
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"id": "note-1"}
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.post = AsyncMock(return_value=mock_response)
+@pytest.mark.asyncio(loop_scope="module")
+async def test_add_note_to_intercom_sends_note_type(monkeypatch):
+    mock_client = make_mock_httpx_client(response_json={"id": "note-1"})
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
 
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        result = await add_note_to_intercom("conv-2", "Internal note text")
+    result = await add_note_to_intercom("conv-2", "Internal note text")
 
     _, kwargs = mock_client.post.call_args
     assert kwargs["json"]["message_type"] == "note"
@@ -337,74 +307,46 @@ async def test_add_note_to_intercom_sends_note_type():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_get_conversation_returns_data():
-    from integrations.intercom import get_conversation_from_intercom
+@pytest.mark.asyncio(loop_scope="module")
+async def test_get_conversation_returns_data(monkeypatch):
+    mock_client = make_mock_httpx_client(
+        "get", response_json={"id": "conv-99", "state": "open"}
+    )
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
 
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"id": "conv-99", "state": "open"}
-    mock_response.raise_for_status = MagicMock()
-
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.get = AsyncMock(return_value=mock_response)
-
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        result = await get_conversation_from_intercom("conv-99")
+    result = await get_conversation_from_intercom("conv-99")
 
     assert result["id"] == "conv-99"
     assert result["state"] == "open"
 
 
-@pytest.mark.asyncio
-async def test_post_reply_includes_admin_id_in_payload():
+@pytest.mark.asyncio(loop_scope="module")
+async def test_post_reply_includes_admin_id_in_payload(monkeypatch):
     """admin_id is added to the request payload when provided."""
-    from integrations.intercom import post_reply_to_intercom
-
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"id": "reply-admin"}
-    mock_response.raise_for_status = MagicMock()
+    mock_client = make_mock_httpx_client(response_json={"id": "reply-admin"})
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
 
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.post = AsyncMock(return_value=mock_response)
-
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        await post_reply_to_intercom("conv-1", "Hello!", admin_id="admin-007")
+    await post_reply_to_intercom("conv-1", "Hello!", admin_id="admin-007")
 
     _, kwargs = mock_client.post.call_args
     assert kwargs["json"].get("admin_id") == "admin-007"
 
 
-@pytest.mark.asyncio
-async def test_add_note_raises_on_http_error():
+@pytest.mark.asyncio(loop_scope="module")
+async def test_add_note_raises_on_http_error(monkeypatch):
     """add_note_to_intercom re-raises httpx.HTTPError."""
-    import httpx
-    from integrations.intercom import add_note_to_intercom
-
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.post = AsyncMock(side_effect=httpx.HTTPError("server down"))
+    mock_client = make_mock_httpx_client(side_effect=httpx.HTTPError("server down"))
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
 
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        with pytest.raises(httpx.HTTPError):
-            await add_note_to_intercom("conv-err", "note text")
+    with pytest.raises(httpx.HTTPError):
+        await add_note_to_intercom("conv-err", "note text")
 
 
-@pytest.mark.asyncio
-async def test_get_conversation_raises_on_http_error():
+@pytest.mark.asyncio(loop_scope="module")
+async def test_get_conversation_raises_on_http_error(monkeypatch):
     """get_conversation_from_intercom re-raises httpx.HTTPError."""
-    import httpx
-    from integrations.intercom import get_conversation_from_intercom
-
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.get = AsyncMock(side_effect=httpx.HTTPError("timeout"))
+    mock_client = make_mock_httpx_client("get", side_effect=httpx.HTTPError("timeout"))
+    monkeypatch.setattr(intercom.httpx, "AsyncClient", lambda *a, **kw: mock_client)
 
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        with pytest.raises(httpx.HTTPError):
-            await get_conversation_from_intercom("conv-err")
+    with pytest.raises(httpx.HTTPError):
+        await get_conversation_from_intercom("conv-err")
@@ -7,8 +7,17 @@ All HTTP calls are mocked — no real Jira instance required.
 import base64
 import json
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import httpx
+
+from integrations.tools.jira_tools import (
+    _basic_auth_header,
+    create_jira_ticket,
+    get_jira_ticket,
+    search_jira_tickets,
+)
 from shared.config import settings
 
 # ---------------------------------------------------------------------------
@@ -16,23 +25,33 @@ from shared.config import settings
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(autouse=True)
-def jira_settings(monkeypatch):
-    """Ensure settings have Jira credentials for all tests in this module."""
-    monkeypatch.setattr(settings, "jira_email", "mock@example.com")
-    monkeypatch.setattr(settings, "jira_api_token", "mock-jira-token")
-    monkeypatch.setattr(settings, "jira_base_url", "https://mock.atlassian.net")
-    monkeypatch.setattr(settings, "jira_project_key", "SUP")
+_JIRA_SETTINGS = {
+    "jira_email": "mock@example.com",
+    "jira_api_token": "mock-jira-token",
+    "jira_base_url": "https://mock.atlassian.net",
+    "jira_project_key": "SUP",
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def jira_settings():
+    """Ensure settings have Jira credentials for all tests in this module.
+
+    Applied once per module; tests that blank out a single credential use
+    their own function-scoped ``monkeypatch``, which is undone first.
+    """
+    with patch.multiple(settings, **_JIRA_SETTINGS):
+        yield
 
 
 def _make_httpx_response(json_body: dict, status_code: int = 200):
-    """Build a minimal mock httpx response."""
-    mock = MagicMock()
-    mock.json.return_value = json_body
-    mock.status_code = status_code
-    mock.text = json.dumps(json_body)
-    mock.raise_for_status.return_value = None
-    return mock
+    """Build a minimal stand-in httpx response."""
+    return SimpleNamespace(
+        json=lambda: json_body,
+        status_code=status_code,
+        text=json.dumps(json_body),
+        raise_for_status=lambda: None,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -42,8 +61,6 @@ def _make_httpx_response(json_body: dict, status_code: int = 200):
 
 def test_create_jira_ticket_success(mocker):
     """create_jira_ticket returns key and URL on a 201 response."""
-    from integrations.tools.jira_tools import create_jira_ticket
-
     mock_resp = _make_httpx_response({"key": "SUP-42", "id": "10042"}, 201)
     mock_post = mocker.patch(
         "integrations.tools.jira_tools.httpx.post", return_value=mock_resp
@@ -71,19 +88,17 @@ def test_create_jira_ticket_success(mocker):
 
 def test_create_jira_ticket_basic_auth_encoding():
     """Basic auth header must be base64(email:token)."""
-    from integrations.tools.jira_tools import _basic_auth_header
-
     header = _basic_auth_header()
     assert header.startswith("Basic ")
     encoded_part = header[len("Basic ") :]
     decoded = base64.b64decode(encoded_part).decode()
     assert decoded == "mock@example.com:mock-jira-token"
+    # Same credentials hit the cached value rather than re-encoding.
+    assert _basic_auth_header() is header
 
 
 def test_create_jira_ticket_uses_configured_project_key(mocker):
     """create_jira_ticket sends the configurable project key, not a hardcoded value."""
-    from integrations.tools.jira_tools import create_jira_ticket
-
     mock_resp = _make_httpx_response({"key": "OPS-7", "id": "20007"})
     mock_post = mocker.patch(
         "integrations.tools.jira_tools.httpx.post", return_value=mock_resp
@@ -100,8 +115,6 @@ def test_create_jira_ticket_uses_configured_project_key(mocker):
 
 def test_create_jira_ticket_missing_config(monkeypatch):
     """Returns error dict when Jira credentials are not configured."""
-    from integrations.tools.jira_tools import create_jira_ticket
-
     monkeypatch.setattr(settings, "jira_email", "")
 
     result = create_jira_ticket.invoke({"summary": "Test", "description": "Test desc"})
@@ -115,8 +128,6 @@ def test_create_jira_ticket_missing_config(monkeypatch):
 
 def test_search_jira_tickets_success(mocker):
     """search_jira_tickets returns a list of matching tickets."""
-    from integrations.tools.jira_tools import search_jira_tickets
-
     jira_response = {
         "issues": [
             {
@@ -144,8 +155,6 @@ def test_search_jira_tickets_success(mocker):
 
 def test_search_jira_tickets_missing_config(monkeypatch):
     """Returns error list when Jira is not configured."""
-    from integrations.tools.jira_tools import search_jira_tickets
-
     monkeypatch.setattr(settings, "jira_api_token", "")
 
     results = search_jira_tickets.invoke({"query": "project=SUP"})
@@ -160,8 +169,6 @@ def test_search_jira_tickets_missing_config(monkeypatch):
 
 def test_get_jira_ticket_success(mocker):
     """get_jira_ticket returns full ticket details."""
-    from integrations.tools.jira_tools import get_jira_ticket
-
     ticket_response = {
         "key": "SUP-42",
         "fields": {
@@ -193,8 +200,6 @@ def test_get_jira_ticket_success(mocker):
 
 def _http_status_error(status_code: int = 404, body: str = "Not Found"):
     """Build a minimal httpx.HTTPStatusError."""
-    import httpx
-
     mock_response = MagicMock()
     mock_response.status_code = status_code
     mock_response.text = body
@@ -206,92 +211,92 @@ def _http_status_error(status_code: int = 404, body: str = "Not Found"):
 
 
 def _http_error(msg: str = "connection error"):
-    import httpx
-
     return httpx.HTTPError(msg)
 
 
-def test_create_jira_ticket_http_status_error(mocker):
-    """create_jira_ticket returns error dict on HTTPStatusError (e.g. 400)."""
-    from integrations.tools.jira_tools import create_jira_ticket
-
+# Prebuilt once: the tools only read status_code/text, so instances can be reused.
+_EXC_400 = _http_status_error(400, "Bad Request")
+_EXC_403 = _http_status_error(403, "Forbidden")
+_EXC_404 = _http_status_error(404, "Not Found")
+_EXC_NET_TIMEOUT = _http_error("timeout")
+_EXC_NET_DNS = _http_error("dns failure")
+_EXC_NET_REFUSED = _http_error("connection refused")
+
+
+@pytest.mark.parametrize(
+    "tool_fn, tool_input, http_method, exc, expected_status",
+    [
+        pytest.param(
+            create_jira_ticket,
+            {"summary": "fail", "description": "fail"},
+            "post",
+            _EXC_400,
+            "400",
+            id="create-status-400",
+        ),
+        pytest.param(
+            create_jira_ticket,
+            {"summary": "fail", "description": "fail"},
+            "post",
+            _EXC_NET_TIMEOUT,
+            None,
+            id="create-network",
+        ),
+        pytest.param(
+            search_jira_tickets,
+            {"query": "project=SUP"},
+            "get",
+            _EXC_403,
+            "403",
+            id="search-status-403",
+        ),
+        pytest.param(
+            search_jira_tickets,
+            {"query": "project=SUP"},
+            "get",
+            _EXC_NET_DNS,
+            None,
+            id="search-network",
+        ),
+        pytest.param(
+            get_jira_ticket,
+            {"ticket_key": "SUP-MISSING"},
+            "get",
+            _EXC_404,
+            "404",
+            id="get-status-404",
+        ),
+        pytest.param(
+            get_jira_ticket,
+            {"ticket_key": "SUP-OFFLINE"},
+            "get",
+            _EXC_NET_REFUSED,
+            None,
+            id="get-network",
+        ),
+    ],
+)
+def test_tool_returns_error_on_http_failure(
+    mocker, tool_fn, tool_input, http_method, exc, expected_status
+):
+    """Jira tools turn HTTPStatusError / network HTTPError into an error payload."""
     mocker.patch(
-        "integrations.tools.jira_tools.httpx.post",
-        side_effect=_http_status_error(400, "Bad Request"),
+        f"integrations.tools.jira_tools.httpx.{http_method}",
+        side_effect=exc,
     )
-    result = create_jira_ticket.invoke({"summary": "fail", "description": "fail"})
-    assert "error" in result
-    assert "400" in result["error"]
-
+    result = tool_fn.invoke(tool_input)
 
-def test_create_jira_ticket_http_error(mocker):
-    """create_jira_ticket returns error dict on network HTTPError."""
-    from integrations.tools.jira_tools import create_jira_ticket
-
-    mocker.patch(
-        "integrations.tools.jira_tools.httpx.post",
-        side_effect=_http_error("timeout"),
-    )
-    result = create_jira_ticket.invoke({"summary": "fail", "description": "fail"})
-    assert "error" in result
-
-
-def test_search_jira_tickets_http_status_error(mocker):
-    """search_jira_tickets returns error list on HTTPStatusError."""
-    from integrations.tools.jira_tools import search_jira_tickets
-
-    mocker.patch(
-        "integrations.tools.jira_tools.httpx.get",
-        side_effect=_http_status_error(403, "Forbidden"),
-    )
-    result = search_jira_tickets.invoke({"query": "project=SUP"})
-    assert isinstance(result, list)
-    assert "error" in result[0]
-    assert "403" in result[0]["error"]
-
-
-def test_search_jira_tickets_http_error(mocker):
-    """search_jira_tickets returns error list on network error."""
-    from integrations.tools.jira_tools import search_jira_tickets
-
-    mocker.patch(
-        "integrations.tools.jira_tools.httpx.get",
-        side_effect=_http_error("dns failure"),
-    )
-    result = search_jira_tickets.invoke({"query": "project=SUP"})
-    assert isinstance(result, list)
-    assert "error" in result[0]
-
-
-def test_get_jira_ticket_http_status_error(mocker):
-    """get_jira_ticket returns error dict on HTTPStatusError."""
-    from integrations.tools.jira_tools import get_jira_ticket
-
-    mocker.patch(
-        "integrations.tools.jira_tools.httpx.get",
-        side_effect=_http_status_error(404, "Not Found"),
-    )
-    result = get_jira_ticket.invoke({"ticket_key": "SUP-MISSING"})
-    assert "error" in result
-    assert "404" in result["error"]
-
-
-def test_get_jira_ticket_http_error(mocker):
-    """get_jira_ticket returns error dict on network error."""
-    from integrations.tools.jira_tools import get_jira_ticket
-
-    mocker.patch(
-        "integrations.tools.jira_tools.httpx.get",
-        side_effect=_http_error("connection refused"),
-    )
-    result = get_jira_ticket.invoke({"ticket_key": "SUP-OFFLINE"})
+    # search_jira_tickets returns a list of results; the others return a dict
+    if tool_fn is search_jira_tickets:
+        assert isinstance(result, list)
+        result = result[0]
     assert "error" in result
+    if expected_status is not None:
+        assert expected_status in result["error"]
 
 
 def test_get_jira_ticket_missing_config(monkeypatch):
     """Returns error dict when Jira credentials are not configured."""
-    from integrations.tools.jira_tools import get_jira_ticket
-
     monkeypatch.setattr(settings, "jira_base_url", "")
 
     result = get_jira_ticket.invoke({"ticket_key": "SUP-1"})
@@ -6,26 +6,20 @@ All Cosmos DB calls are mocked — no real Azure services required.
 
 import pytest
 from unittest.mock import MagicMock, patch, call
+from azure.cosmos import ContainerProxy, CosmosClient, DatabaseProxy
 from azure.cosmos.exceptions import CosmosHttpResponseError
 
+import shared.memory as _mem_mod
+from shared.memory import ConversationMemory
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
-def _cosmos_404():
-    """Build a CosmosHttpResponseError that looks like a 404."""
-    err = CosmosHttpResponseError.__new__(CosmosHttpResponseError)
-    err.status_code = 404
-    err.message = "Not Found"
-    return err
-
-
-def _cosmos_500():
-    err = CosmosHttpResponseError.__new__(CosmosHttpResponseError)
-    err.status_code = 500
-    err.message = "Internal Server Error"
-    return err
+# Built once and reused: the code under test only inspects status_code.
+_COSMOS_404 = CosmosHttpResponseError(status_code=404, message="Not Found")
+_COSMOS_500 = CosmosHttpResponseError(status_code=500, message="Internal Server Error")
 
 
 def _make_mock_cosmos():
@@ -33,16 +27,16 @@ def _make_mock_cosmos():
     Return a fully-mocked CosmosClient + mock container.
     Returns (mock_client_class, mock_state_container).
     """
-    mock_state_container = MagicMock()
-    mock_registry_container = MagicMock()
+    mock_state_container = MagicMock(spec=ContainerProxy)
+    mock_registry_container = MagicMock(spec=ContainerProxy)
 
-    mock_database = MagicMock()
+    mock_database = MagicMock(spec=DatabaseProxy)
     mock_database.create_container_if_not_exists.side_effect = [
         mock_state_container,
         mock_registry_container,
     ]
 
-    mock_client = MagicMock()
+    mock_client = MagicMock(spec=CosmosClient)
     mock_client.create_database_if_not_exists.return_value = mock_database
 
     mock_client_class = MagicMock(return_value=mock_client)
@@ -50,6 +44,32 @@ def _make_mock_cosmos():
     return mock_client_class, mock_state_container, mock_registry_container
 
 
+@pytest.fixture(scope="session")
+def cosmos_mock_template():
+    """Build the mocked Cosmos client tree once for the whole session."""
+    return _make_mock_cosmos()
+
+
+@pytest.fixture
+def mock_cosmos(mocker, cosmos_mock_template):
+    """
+    Reset the shared Cosmos mocks and patch them into shared.memory.
+    Returns (mock_client_class, mock_state_container, mock_registry_container).
+    """
+    mock_cls, mock_state_cont, mock_reg_cont = cosmos_mock_template
+    # The client class keeps its return_value so the client/database chain survives.
+    mock_cls.reset_mock()
+    mock_state_cont.reset_mock(return_value=True, side_effect=True)
+    mock_reg_cont.reset_mock(return_value=True, side_effect=True)
+    mock_database = mock_cls.return_value.create_database_if_not_exists.return_value
+    mock_database.create_container_if_not_exists.side_effect = [
+        mock_state_cont,
+        mock_reg_cont,
+    ]
+    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    return cosmos_mock_template
+
+
 # ---------------------------------------------------------------------------
 # Lazy initialisation
 # ---------------------------------------------------------------------------
@@ -57,18 +77,13 @@ def _make_mock_cosmos():
 
 def test_lazy_init_no_cosmos_on_import():
     """Importing shared.memory must not make any real Cosmos calls."""
-    import shared.memory as m
-
     # The global instance should exist but not be connected yet
-    assert m.memory._client is None
+    assert _mem_mod.memory._client is None
 
 
-def test_lazy_init_connects_on_first_use(mocker):
+def test_lazy_init_connects_on_first_use(mock_cosmos):
     """_ensure_connected() is called once on the first operation and not again."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
 
     mem = ConversationMemory()
     assert mem._client is None  # not connected yet
@@ -88,12 +103,9 @@ def test_lazy_init_connects_on_first_use(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_save_state_upserts_document(mocker):
+def test_save_state_upserts_document(mock_cosmos):
     """save_state calls upsert_item with correct document shape."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
 
     mem = ConversationMemory()
     mem.save_state("conv-123", {"status": "success", "message": "ok"})
@@ -106,13 +118,10 @@ def test_save_state_upserts_document(mocker):
     assert "updated_at" in doc
 
 
-def test_save_state_raises_on_cosmos_error(mocker):
+def test_save_state_raises_on_cosmos_error(mock_cosmos):
     """save_state re-raises CosmosHttpResponseError from upsert_item."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-    mock_state_cont.upsert_item.side_effect = _cosmos_500()
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
+    mock_state_cont.upsert_item.side_effect = _COSMOS_500
 
     mem = ConversationMemory()
     with pytest.raises(CosmosHttpResponseError):
@@ -124,19 +133,17 @@ def test_save_state_raises_on_cosmos_error(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_load_state_returns_state(mocker):
-    """load_state returns the state dict stored inside the Cosmos document."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+@pytest.mark.parametrize("method", ["load_state", "get_state"])
+def test_read_returns_state(mock_cosmos, method):
+    """load_state (and its get_state alias) return the stored state dict."""
+    mock_cls, mock_state_cont, _ = mock_cosmos
     mock_state_cont.read_item.return_value = {
         "id": "conv-abc",
         "state": {"status": "success", "message": "hello"},
     }
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
-    result = mem.load_state("conv-abc")
+    result = getattr(mem, method)("conv-abc")
 
     assert result == {"status": "success", "message": "hello"}
     mock_state_cont.read_item.assert_called_once_with(
@@ -144,13 +151,10 @@ def test_load_state_returns_state(mocker):
     )
 
 
-def test_load_state_returns_none_on_404(mocker):
+def test_load_state_returns_none_on_404(mock_cosmos):
     """load_state returns None (not raises) when the document does not exist."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-    mock_state_cont.read_item.side_effect = _cosmos_404()
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
+    mock_state_cont.read_item.side_effect = _COSMOS_404
 
     mem = ConversationMemory()
     result = mem.load_state("does-not-exist")
@@ -158,25 +162,10 @@ def test_load_state_returns_none_on_404(mocker):
     assert result is None
 
 
-def test_get_state_is_alias_for_load_state(mocker):
-    """get_state and load_state return the same value for the same conversation."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-    mock_state_cont.read_item.return_value = {"id": "c1", "state": {"x": 1}}
-
-    from shared.memory import ConversationMemory
-
-    mem = ConversationMemory()
-    assert mem.get_state("c1") == mem.load_state("c1")
-
-
-def test_load_state_raises_on_non_404_cosmos_error(mocker):
+def test_load_state_raises_on_non_404_cosmos_error(mock_cosmos):
     """load_state propagates non-404 Cosmos errors to the caller."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-    mock_state_cont.read_item.side_effect = _cosmos_500()
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
+    mock_state_cont.read_item.side_effect = _COSMOS_500
 
     mem = ConversationMemory()
     with pytest.raises(CosmosHttpResponseError):
@@ -188,12 +177,9 @@ def test_load_state_raises_on_non_404_cosmos_error(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_delete_state_calls_delete_item(mocker):
+def test_delete_state_calls_delete_item(mock_cosmos):
     """delete_state calls delete_item with the correct partition key."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
 
     mem = ConversationMemory()
     mem.delete_state("conv-delete-me")
@@ -203,13 +189,10 @@ def test_delete_state_calls_delete_item(mocker):
     )
 
 
-def test_delete_state_silently_ignores_404(mocker):
+def test_delete_state_silently_ignores_404(mock_cosmos):
     """delete_state does not raise when document is already gone (idempotent)."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-    mock_state_cont.delete_item.side_effect = _cosmos_404()
-
-    from shared.memory import ConversationMemory
+    mock_cls, mock_state_cont, _ = mock_cosmos
+    mock_state_cont.delete_item.side_effect = _COSMOS_404
 
     mem = ConversationMemory()
     mem.delete_state("already-gone")  # must not raise
@@ -220,12 +203,9 @@ def test_delete_state_silently_ignores_404(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_register_agent_upserts_document(mocker):
+def test_register_agent_upserts_document(mock_cosmos):
     """register_agent upserts a document in the registry container."""
-    mock_cls, _, mock_reg_cont = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-
-    from shared.memory import ConversationMemory
+    mock_cls, _, mock_reg_cont = mock_cosmos
 
     mem = ConversationMemory()
     mem.register_agent(
@@ -239,27 +219,21 @@ def test_register_agent_upserts_document(mocker):
     assert doc["name"] == "Billing Agent"
 
 
-def test_get_agent_config_returns_doc(mocker):
+def test_get_agent_config_returns_doc(mock_cosmos):
     """get_agent_config returns the registry document for a topic."""
-    mock_cls, _, mock_reg_cont = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    mock_cls, _, mock_reg_cont = mock_cosmos
     mock_reg_cont.read_item.return_value = {"id": "billing", "topic": "billing"}
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
     result = mem.get_agent_config("billing")
 
     assert result["topic"] == "billing"
 
 
-def test_get_agent_config_returns_none_on_404(mocker):
+def test_get_agent_config_returns_none_on_404(mock_cosmos):
     """get_agent_config returns None when the topic is not registered."""
-    mock_cls, _, mock_reg_cont = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-    mock_reg_cont.read_item.side_effect = _cosmos_404()
-
-    from shared.memory import ConversationMemory
+    mock_cls, _, mock_reg_cont = mock_cosmos
+    mock_reg_cont.read_item.side_effect = _COSMOS_404
 
     mem = ConversationMemory()
     result = mem.get_agent_config("unknown_topic")
@@ -267,16 +241,13 @@ def test_get_agent_config_returns_none_on_404(mocker):
     assert result is None
 
 
-def test_list_agents_returns_list(mocker):
+def test_list_agents_returns_list(mock_cosmos):
     """list_agents queries the registry and returns a list of configs."""
-    mock_cls, _, mock_reg_cont = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    mock_cls, _, mock_reg_cont = mock_cosmos
     mock_reg_cont.query_items.return_value = iter(
         [{"id": "billing"}, {"id": "technical"}]
     )
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
     agents = mem.list_agents()
 
@@ -289,12 +260,9 @@ def test_list_agents_returns_list(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_client_property_returns_cosmos_client(mocker):
+def test_client_property_returns_cosmos_client(mock_cosmos):
     """Accessing the client property triggers connection and returns CosmosClient."""
-    mock_cls, _, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-
-    from shared.memory import ConversationMemory
+    mock_cls, _, _ = mock_cosmos
 
     mem = ConversationMemory()
     client = mem.client
@@ -303,12 +271,9 @@ def test_client_property_returns_cosmos_client(mocker):
     mock_cls.assert_called_once()
 
 
-def test_database_property_returns_database(mocker):
+def test_database_property_returns_database(mock_cosmos):
     """Accessing the database property triggers connection and returns the database."""
-    mock_cls, _, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
-
-    from shared.memory import ConversationMemory
+    mock_cls, _, _ = mock_cosmos
 
     mem = ConversationMemory()
     db = mem.database
@@ -322,16 +287,13 @@ def test_database_property_returns_database(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_delete_state_non_404_error_handled_silently(mocker):
+def test_delete_state_non_404_error_handled_silently(mock_cosmos):
     """delete_state silently handles non-404 Cosmos errors (prints, no raise)."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    mock_cls, mock_state_cont, _ = mock_cosmos
     mock_state_cont.delete_item.side_effect = CosmosHttpResponseError(
         status_code=500, message="Internal Server Error"
     )
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
     # Must not raise — just prints and continues
     mem.delete_state("conv-500")  # no exception expected
@@ -342,16 +304,13 @@ def test_delete_state_non_404_error_handled_silently(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_get_agent_config_non_404_cosmos_error_reraises(mocker):
+def test_get_agent_config_non_404_cosmos_error_reraises(mock_cosmos):
     """get_agent_config re-raises non-404 Cosmos errors."""
-    mock_cls, _, mock_reg_cont = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    mock_cls, _, mock_reg_cont = mock_cosmos
     mock_reg_cont.read_item.side_effect = CosmosHttpResponseError(
         status_code=500, message="Internal Server Error"
     )
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
     with pytest.raises(CosmosHttpResponseError):
         mem.get_agent_config("billing")
@@ -362,16 +321,13 @@ def test_get_agent_config_non_404_cosmos_error_reraises(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_register_agent_cosmos_error_reraises(mocker):
+def test_register_agent_cosmos_error_reraises(mock_cosmos):
     """register_agent re-raises CosmosHttpResponseError from upsert_item."""
-    mock_cls, _, mock_reg_cont = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    mock_cls, _, mock_reg_cont = mock_cosmos
     mock_reg_cont.upsert_item.side_effect = CosmosHttpResponseError(
         status_code=500, message="Write failed"
     )
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
     with pytest.raises(CosmosHttpResponseError):
         mem.register_agent("billing", {"name": "Billing Agent"})
@@ -382,10 +338,9 @@ def test_register_agent_cosmos_error_reraises(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_add_feedback_appends_feedback_and_saves(mocker):
+def test_add_feedback_appends_feedback_and_saves(mock_cosmos):
     """add_feedback loads existing state, appends feedback, and saves updated state."""
-    mock_cls, mock_state_cont, _ = _make_mock_cosmos()
-    mocker.patch("shared.memory.CosmosClient", mock_cls)
+    mock_cls, mock_state_cont, _ = mock_cosmos
 
     existing_state = {"status": "success", "message": "Done"}
     mock_state_cont.read_item.return_value = {
@@ -393,8 +348,6 @@ def test_add_feedback_appends_feedback_and_saves(mocker):
         "state": existing_state,
     }
 
-    from shared.memory import ConversationMemory
-
     mem = ConversationMemory()
     mem.add_feedback("conv-fb", {"rating": 5, "comment": "Excellent"})
 
@@ -7,6 +7,12 @@ Azure Search and OpenAI embedding calls are fully mocked.
 import pytest
 from unittest.mock import MagicMock, patch, call
 
+from azure.search.documents import SearchClient
+
+from shared import rag as rag_module
+from shared.config import settings
+from shared.rag import RAGKnowledgeBase
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -32,30 +38,61 @@ def _make_search_result(
     }
 
 
-def _patched_rag(mocker):
+# retrieve_context only iterates the search results, so immutable tuples of
+# these shared docs can be handed to the mocked search() in any test.
+_SEARCH_DOC_1 = _make_search_result("doc1", "How to pay your invoice")
+_SEARCH_DOC_RETURNS = _make_search_result(
+    "d1", "content here", title="My Title", topic="returns"
+)
+
+# ada-002 sized embeddings, shared read-only by every test.
+_EMBED_1536 = (0.1,) * 1536
+_EMBED_1536_HALF = (0.5,) * 1536
+
+
+@pytest.fixture(scope="session")
+def rag_mock_template():
+    """Build the mocked search client / embeddings pair once for the session."""
+    return MagicMock(spec=SearchClient), MagicMock()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _search_patches(rag_mock_template):
     """
-    Return a RAGKnowledgeBase whose internal Azure clients are mocked.
-    Also patches settings so _ensure_connected succeeds.
+    Swap shared.rag's SearchClient / AzureOpenAIEmbeddings for mocks once per
+    module. Yields the (mock_search_client, mock_embeddings) instances.
     """
-    from shared.config import settings
-
-    mocker.patch.object(
-        settings, "azure_search_endpoint", "https://test.search.windows.net"
+    mock_search_client, mock_embeddings = rag_mock_template
+    mp = pytest.MonkeyPatch()
+    mp.setattr(rag_module, "SearchClient", MagicMock(return_value=mock_search_client))
+    mp.setattr(
+        rag_module, "AzureOpenAIEmbeddings", MagicMock(return_value=mock_embeddings)
     )
-    mocker.patch.object(settings, "azure_search_key", "test-key-123")
-    mocker.patch.object(
-        settings, "azure_openai_endpoint", "https://test.openai.azure.com"
-    )
-    mocker.patch.object(settings, "azure_openai_api_key", "test-oai-key")
+    yield mock_search_client, mock_embeddings
+    mp.undo()
 
-    mock_search_client = MagicMock()
-    mock_embeddings = MagicMock()
-    mock_embeddings.embed_query.return_value = [0.1] * 1536
 
-    mocker.patch("shared.rag.SearchClient", return_value=mock_search_client)
-    mocker.patch("shared.rag.AzureOpenAIEmbeddings", return_value=mock_embeddings)
+@pytest.fixture
+def patched_rag(mocker, _search_patches):
+    """
+    Return a RAGKnowledgeBase whose internal Azure clients are mocked.
+    Also patches settings so _ensure_connected succeeds.
+    The module-wide mocks from ``_search_patches`` are reset before reuse.
+    """
+    mocker.patch.multiple(
+        settings,
+        azure_search_endpoint="https://test.search.windows.net",
+        azure_search_key="test-key-123",
+        azure_openai_endpoint="https://test.openai.azure.com",
+        azure_openai_api_key="test-oai-key",
+    )
 
-    from shared.rag import RAGKnowledgeBase
+    mock_search_client, mock_embeddings = _search_patches
+    rag_module.SearchClient.reset_mock()
+    rag_module.AzureOpenAIEmbeddings.reset_mock()
+    mock_search_client.reset_mock(return_value=True, side_effect=True)
+    mock_embeddings.reset_mock(return_value=True, side_effect=True)
+    mock_embeddings.embed_query.return_value = _EMBED_1536
 
     kb = RAGKnowledgeBase(index_name="test-index")
     return kb, mock_search_client, mock_embeddings
@@ -68,36 +105,30 @@ def _patched_rag(mocker):
 
 def test_lazy_init_no_clients_before_first_use():
     """Creating a RAGKnowledgeBase must not connect to Azure on __init__."""
-    from shared.rag import RAGKnowledgeBase
-
     kb = RAGKnowledgeBase()
     assert kb._search_client is None
     assert kb._embeddings is None
 
 
-def test_ensure_connected_creates_clients(mocker):
-    kb, mock_sc, mock_emb = _patched_rag(mocker)
+def test_ensure_connected_creates_clients(patched_rag):
+    kb, mock_sc, mock_emb = patched_rag
     # Accessing the property triggers _ensure_connected
     _ = kb.search_client
     assert kb._search_client is not None
     assert kb._embeddings is not None
 
 
-def test_ensure_connected_only_calls_once(mocker):
-    kb, _, _ = _patched_rag(mocker)
+def test_ensure_connected_only_calls_once(patched_rag):
+    kb, _, _ = patched_rag
     _ = kb.search_client
     _ = kb.search_client
     _ = kb.embeddings
     # SearchClient constructor only called once despite multiple property accesses
-    from shared import rag as rag_module
-
     assert rag_module.SearchClient.call_count == 1  # type: ignore[attr-defined]
 
 
 def test_ensure_connected_raises_without_config():
     """_ensure_connected raises RuntimeError if search credentials are missing."""
-    from shared.config import settings
-    from shared.rag import RAGKnowledgeBase
     import unittest.mock as mock_lib
 
     with (
@@ -114,12 +145,11 @@ def test_ensure_connected_raises_without_config():
 # ---------------------------------------------------------------------------
 
 
-def test_retrieve_context_hybrid_search(mocker):
+def test_retrieve_context_hybrid_search(patched_rag):
     """Hybrid search (default) calls search_client.search with text + vector."""
-    kb, mock_sc, _ = _patched_rag(mocker)
+    kb, mock_sc, _ = patched_rag
 
-    docs = [_make_search_result("doc1", "How to pay your invoice")]
-    mock_sc.search.return_value = iter(docs)
+    mock_sc.search.return_value = (_SEARCH_DOC_1,)
 
     result = kb.retrieve_context("how to pay", topic="billing", top_k=3)
 
@@ -130,39 +160,29 @@ def test_retrieve_context_hybrid_search(mocker):
     assert result[0]["content"] == "How to pay your invoice"
 
 
-def test_retrieve_context_vector_only(mocker):
-    """Passing use_hybrid=False sends search_text=None."""
-    kb, mock_sc, _ = _patched_rag(mocker)
-    mock_sc.search.return_value = iter([])
-
-    kb.retrieve_context("password reset", use_hybrid=False)
-
-    call_kwargs = mock_sc.search.call_args[1]
-    assert call_kwargs["search_text"] is None
-
-
-def test_retrieve_context_applies_topic_filter(mocker):
-    kb, mock_sc, _ = _patched_rag(mocker)
-    mock_sc.search.return_value = iter([])
-
-    kb.retrieve_context("reset password", topic="technical")
+@pytest.mark.parametrize(
+    "kwargs, expected_key, expected_val",
+    [
+        pytest.param({"use_hybrid": False}, "search_text", None, id="vector-only"),
+        pytest.param(
+            {"topic": "technical"}, "filter", "topic eq 'technical'", id="topic"
+        ),
+        pytest.param({}, "filter", None, id="no-topic"),
+    ],
+)
+def test_retrieve_context_kwargs(patched_rag, kwargs, expected_key, expected_val):
+    """retrieve_context maps its arguments onto the search() call kwargs."""
+    kb, mock_sc, _ = patched_rag
+    mock_sc.search.return_value = ()
 
-    call_kwargs = mock_sc.search.call_args[1]
-    assert call_kwargs["filter"] == "topic eq 'technical'"
-
-
-def test_retrieve_context_no_topic_filter(mocker):
-    kb, mock_sc, _ = _patched_rag(mocker)
-    mock_sc.search.return_value = iter([])
-
-    kb.retrieve_context("anything")
+    kb.retrieve_context("reset password", **kwargs)
 
     call_kwargs = mock_sc.search.call_args[1]
-    assert call_kwargs["filter"] is None
+    assert call_kwargs[expected_key] == expected_val
 
 
-def test_retrieve_context_returns_empty_list_on_exception(mocker):
-    kb, mock_sc, _ = _patched_rag(mocker)
+def test_retrieve_context_returns_empty_list_on_exception(patched_rag):
+    kb, mock_sc, _ = patched_rag
     mock_sc.search.side_effect = RuntimeError("search unavailable")
 
     result = kb.retrieve_context("crash query")
@@ -170,12 +190,10 @@ def test_retrieve_context_returns_empty_list_on_exception(mocker):
     assert result == []
 
 
-def test_retrieve_context_result_shape(mocker):
+def test_retrieve_context_result_shape(patched_rag):
     """Each returned item has the expected keys."""
-    kb, mock_sc, _ = _patched_rag(mocker)
-    mock_sc.search.return_value = iter(
-        [_make_search_result("d1", "content here", title="My Title", topic="returns")]
-    )
+    kb, mock_sc, _ = patched_rag
+    mock_sc.search.return_value = (_SEARCH_DOC_RETURNS,)
 
     result = kb.retrieve_context("anything")
 
@@ -191,15 +209,11 @@ def test_retrieve_context_result_shape(mocker):
 
 
 def test_format_context_for_prompt_empty():
-    from shared.rag import RAGKnowledgeBase
-
     kb = RAGKnowledgeBase()
     assert kb.format_context_for_prompt([]) == "No relevant context found."
 
 
 def test_format_context_for_prompt_includes_source_numbers():
-    from shared.rag import RAGKnowledgeBase
-
     kb = RAGKnowledgeBase()
     docs = [
         {
@@ -219,8 +233,6 @@ def test_format_context_for_prompt_includes_source_numbers():
 
 
 def test_format_context_for_prompt_skips_empty_url():
-    from shared.rag import RAGKnowledgeBase
-
     kb = RAGKnowledgeBase()
     docs = [{"title": "T", "url": "", "content": "C"}]
     result = kb.format_context_for_prompt(docs)
@@ -233,9 +245,9 @@ def test_format_context_for_prompt_skips_empty_url():
 # ---------------------------------------------------------------------------
 
 
-def test_add_document_uploads_and_returns_id(mocker):
-    kb, mock_sc, mock_emb = _patched_rag(mocker)
-    mock_emb.embed_query.return_value = [0.5] * 1536
+def test_add_document_uploads_and_returns_id(patched_rag):
+    kb, mock_sc, mock_emb = patched_rag
+    mock_emb.embed_query.return_value = _EMBED_1536_HALF
 
     doc_id = kb.add_document(
         content="How to reset your password.",
@@ -251,8 +263,8 @@ def test_add_document_uploads_and_returns_id(mocker):
     assert uploaded["topic"] == "technical"
 
 
-def test_add_document_raises_on_upload_error(mocker):
-    kb, mock_sc, _ = _patched_rag(mocker)
+def test_add_document_raises_on_upload_error(patched_rag):
+    kb, mock_sc, _ = patched_rag
     mock_sc.upload_documents.side_effect = RuntimeError("upload failed")
 
     with pytest.raises(RuntimeError, match="upload failed"):
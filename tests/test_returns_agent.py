@@ -6,32 +6,102 @@ Creates a fresh agent with mocked LLM and mocked Shopify HTTP calls for each tes
 
 import pytest
 from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import httpx
+
+import integrations.tools.shopify_tools as shopify_tools_mod
+from agents.returns_agent import create_returns_agent
 from shared.config import settings
 
+_SHOPIFY_API = "/admin/api/2024-01"
+
+# Fixed clock shared by the order fixtures and the eligibility check.
+_FIXED_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return _FIXED_NOW
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def shopify_settings(monkeypatch):
+    """Give settings Shopify credentials; requested by tests that reach Shopify."""
     monkeypatch.setattr(settings, "shopify_api_key", "mock-shopify-token")
     monkeypatch.setattr(settings, "shopify_shop_url", "https://mock.myshopify.com")
 
 
+@pytest.fixture(autouse=True)
+def _mock_rag(mocker):
+    mocker.patch("agents.returns_agent.rag.retrieve_context", return_value=[])
+    mocker.patch("agents.returns_agent.rag.format_context_for_prompt", return_value="")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _shopify_route_table():
+    """
+    Route httpx.get / httpx.post through one MockTransport-backed client.
+
+    shopify_tools_mod.httpx is the global httpx module, so this patches httpx
+    process-wide for the whole lifetime of this test module, not only the
+    calls shopify_tools makes.
+
+    Yields the route table ("METHOD /path" -> JSON body) the transport serves
+    from; unknown routes get a 404.
+    """
+    routes: dict = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = routes.get(f"{request.method} {request.url.path}")
+        if body is None:
+            return httpx.Response(404, json={"errors": "Not Found"})
+        return httpx.Response(200, json=body)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    mp = pytest.MonkeyPatch()
+    mp.setattr(shopify_tools_mod.httpx, "get", client.get)
+    mp.setattr(shopify_tools_mod.httpx, "post", client.post)
+    yield routes
+    mp.undo()
+    client.close()
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin shopify_tools' notion of "now" to _FIXED_NOW."""
+    monkeypatch.setattr(shopify_tools_mod, "datetime", _FrozenDatetime)
+
+
+@pytest.fixture
+def shopify_routes(_shopify_route_table):
+    """Empty the shared Shopify route table for this test and return it."""
+    _shopify_route_table.clear()
+    return _shopify_route_table
+
+
+_BASE_STATE_PROTO = {
+    "order_id": "ORD-9001",
+    "customer_email": "customer@example.com",
+    "query": "I want to return my order.",
+    "response": "",
+    "confidence": 0.0,
+}
+
+
 def _base_state(**overrides) -> dict:
-    state = {
-        "messages": [],
-        "order_id": "ORD-9001",
-        "customer_email": "customer@example.com",
-        "query": "I want to return my order.",
-        "response": "",
-        "confidence": 0.0,
-        "sources": [],
-        "tool_results": [],
-    }
+    state = _BASE_STATE_PROTO.copy()
+    # Mutable fields are allocated fresh so tests never share them.
+    state["messages"] = []
+    state["sources"] = []
+    state["tool_results"] = []
     state.update(overrides)
     return state
 
@@ -40,40 +110,29 @@ def _make_llm_pair(
     mocker, *, tool_calls=None, final_text="Return approved.\nCONFIDENCE: 0.88"
 ):
     mock_llm_with_tools = MagicMock()
-    tool_response = MagicMock()
-    tool_response.content = ""
-    tool_response.tool_calls = tool_calls or []
+    tool_response = SimpleNamespace(content="", tool_calls=tool_calls or [])
     mock_llm_with_tools.invoke.return_value = tool_response
 
     mock_llm = MagicMock()
     mock_llm.bind_tools.return_value = mock_llm_with_tools
-    final_response = MagicMock()
-    final_response.content = final_text
+    final_response = SimpleNamespace(content=final_text)
     mock_llm.invoke.return_value = final_response
 
     mocker.patch("agents.returns_agent.AzureChatOpenAI", return_value=mock_llm)
-    mocker.patch("agents.returns_agent.rag.retrieve_context", return_value=[])
-    mocker.patch("agents.returns_agent.rag.format_context_for_prompt", return_value="")
 
     return mock_llm, mock_llm_with_tools
 
 
-def _mock_shopify_get(mocker, json_body: dict):
-    mock_resp = MagicMock()
-    mock_resp.json.return_value = json_body
-    mock_resp.raise_for_status.return_value = None
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
+def _mock_shopify_get(routes: dict, path: str, json_body: dict):
+    routes[f"GET {_SHOPIFY_API}{path}"] = json_body
 
 
-def _mock_shopify_post(mocker, json_body: dict):
-    mock_resp = MagicMock()
-    mock_resp.json.return_value = json_body
-    mock_resp.raise_for_status.return_value = None
-    mocker.patch("integrations.tools.shopify_tools.httpx.post", return_value=mock_resp)
+def _mock_shopify_post(routes: dict, path: str, json_body: dict):
+    routes[f"POST {_SHOPIFY_API}{path}"] = json_body
 
 
 def _recent_order_body(order_id: str = "ORD-9001", days_ago: int = 5) -> dict:
-    created = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    created = _FIXED_NOW - timedelta(days=days_ago)
     return {
         "order": {
             "id": order_id,
@@ -90,6 +149,11 @@ def _recent_order_body(order_id: str = "ORD-9001", days_ago: int = 5) -> dict:
     }
 
 
+# Built once at import time: the mock transport serialises the body per
+# request, so the eligibility test never sees it mutated.
+_ORDER_BODY_7DAYS = _recent_order_body("ORD-9001", days_ago=7)
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -102,8 +166,6 @@ def test_returns_agent_no_tool_calls(mocker):
         final_text="Our return policy allows returns within 30 days.\nCONFIDENCE: 0.95",
     )
 
-    from agents.returns_agent import create_returns_agent
-
     agent = create_returns_agent()
     result = agent.invoke(_base_state(query="What is your return policy?"))
 
@@ -112,7 +174,9 @@ def test_returns_agent_no_tool_calls(mocker):
     assert result["tool_results"] == []
 
 
-def test_returns_agent_checks_eligibility(mocker):
+def test_returns_agent_checks_eligibility(
+    mocker, shopify_routes, shopify_settings, frozen_clock
+):
     """Agent dispatches check_return_eligibility for a specific order."""
     _make_llm_pair(
         mocker,
@@ -121,9 +185,7 @@ def test_returns_agent_checks_eligibility(mocker):
         ],
         final_text="Your order is eligible for return.\nCONFIDENCE: 0.91",
     )
-    _mock_shopify_get(mocker, _recent_order_body("ORD-9001", days_ago=7))
-
-    from agents.returns_agent import create_returns_agent
+    _mock_shopify_get(shopify_routes, "/orders/ORD-9001.json", _ORDER_BODY_7DAYS)
 
     agent = create_returns_agent()
     result = agent.invoke(_base_state())
@@ -132,9 +194,10 @@ def test_returns_agent_checks_eligibility(mocker):
     tr = result["tool_results"][0]
     assert tr["tool"] == "check_return_eligibility"
     assert tr["result"]["eligible"] is True
+    assert tr["result"]["days_since_order"] == 7
 
 
-def test_returns_agent_processes_refund(mocker):
+def test_returns_agent_processes_refund(mocker, shopify_routes, shopify_settings):
     """Agent dispatches create_refund when customer approves the return."""
     _make_llm_pair(
         mocker,
@@ -144,7 +207,8 @@ def test_returns_agent_processes_refund(mocker):
         final_text="Refund of $79.99 has been initiated.\nCONFIDENCE: 0.94",
     )
     _mock_shopify_post(
-        mocker,
+        shopify_routes,
+        "/orders/ORD-9001/refunds.json",
         {
             "refund": {
                 "id": "refund_555",
@@ -156,8 +220,6 @@ def test_returns_agent_processes_refund(mocker):
         },
     )
 
-    from agents.returns_agent import create_returns_agent
-
     agent = create_returns_agent()
     result = agent.invoke(_base_state())
 
@@ -175,8 +237,6 @@ def test_returns_agent_unknown_tool_recorded_as_error(mocker):
         final_text="I cannot do that.\nCONFIDENCE: 0.20",
     )
 
-    from agents.returns_agent import create_returns_agent
-
     agent = create_returns_agent()
     result = agent.invoke(_base_state())
 
@@ -197,8 +257,6 @@ def test_returns_tool_invoke_raises_error_stored(mocker):
         final_text="Could not retrieve order.\nCONFIDENCE: 0.35",
     )
 
-    from agents.returns_agent import create_returns_agent
-
     agent = create_returns_agent()
     result = agent.invoke(_base_state())
 
@@ -211,8 +269,6 @@ def test_returns_confidence_parse_failure_stays_default(mocker):
     """Non-numeric CONFIDENCE value falls back to 0.5 without crashing."""
     _make_llm_pair(mocker, final_text="Return approved.\nCONFIDENCE: maybe")
 
-    from agents.returns_agent import create_returns_agent
-
     agent = create_returns_agent()
     result = agent.invoke(_base_state())
 
@@ -6,9 +6,20 @@ All HTTP calls are mocked — no real Shopify store required.
 
 import json
 import pytest
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from unittest.mock import MagicMock
 
+import httpx
+
+import integrations.tools.shopify_tools as shopify_tools_mod
+from integrations.tools.shopify_tools import (
+    check_return_eligibility,
+    create_refund,
+    get_order,
+    search_orders,
+)
 from shared.config import settings
 
 # ---------------------------------------------------------------------------
@@ -16,39 +27,113 @@ from shared.config import settings
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(autouse=True)
-def shopify_settings(monkeypatch):
-    """Ensure settings have Shopify credentials for all tests in this module."""
-    monkeypatch.setattr(settings, "shopify_api_key", "mock-shopify-token")
-    monkeypatch.setattr(settings, "shopify_shop_url", "https://mock.myshopify.com")
+@pytest.fixture(scope="module", autouse=True)
+def shopify_settings():
+    """Ensure settings have Shopify credentials for all tests in this module.
+
+    Applied once per module; tests that blank out a single credential use
+    their own function-scoped ``monkeypatch``, which is undone first.
+    """
+    mp = pytest.MonkeyPatch()
+    mp.setattr(settings, "shopify_api_key", "mock-shopify-token")
+    mp.setattr(settings, "shopify_shop_url", "https://mock.myshopify.com")
+    yield
+    mp.undo()
+
+
+@pytest.fixture
+def httpx_get(monkeypatch):
+    """Patched shopify_tools httpx.get; tests set return_value or side_effect."""
+    mock_get = MagicMock()
+    monkeypatch.setattr(shopify_tools_mod.httpx, "get", mock_get)
+    return mock_get
+
+
+@pytest.fixture
+def httpx_post(monkeypatch):
+    """Patched shopify_tools httpx.post; tests set return_value or side_effect."""
+    mock_post = MagicMock()
+    monkeypatch.setattr(shopify_tools_mod.httpx, "post", mock_post)
+    return mock_post
+
+
+class _StubResponse:
+    """Minimal stand-in httpx response; ``text`` is only serialised if read."""
+
+    __slots__ = ("_json_body", "status_code", "_text")
+
+    def __init__(self, json_body: dict, status_code: int):
+        self._json_body = json_body
+        self.status_code = status_code
+        self._text = None
+
+    def json(self) -> dict:
+        return self._json_body
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self._json_body)
+        return self._text
+
+    def raise_for_status(self) -> None:
+        return None
 
 
 def _make_httpx_response(json_body: dict, status_code: int = 200):
-    mock = MagicMock()
-    mock.json.return_value = json_body
-    mock.status_code = status_code
-    mock.text = json.dumps(json_body)
-    mock.raise_for_status.return_value = None
-    return mock
-
-
-def _recent_order(order_id: str = "12345", days_ago: int = 5) -> dict:
-    """Build a mock Shopify order payload that is within the return window."""
-    created = datetime.now(timezone.utc) - timedelta(days=days_ago)
-    return {
-        "order": {
-            "id": order_id,
-            "order_number": 1001,
-            "created_at": created.isoformat(),
-            "total_price": "99.99",
-            "currency": "USD",
-            "financial_status": "paid",
-            "fulfillment_status": "fulfilled",
-            "line_items": [
-                {"id": "item1", "title": "Widget", "quantity": 1, "price": "99.99"}
-            ],
+    return _StubResponse(json_body, status_code)
+
+
+# Fixed clock shared by the order fixtures and the eligibility check.
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return _NOW
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin shopify_tools' notion of "now" to _NOW."""
+    monkeypatch.setattr(shopify_tools_mod, "datetime", _FrozenDatetime)
+
+
+@lru_cache(maxsize=None)
+def _created_at(days_ago: int) -> str:
+    return (_NOW - timedelta(days=days_ago)).isoformat()
+
+
+# Fields shared by every mock order; per-order values are spread over it.
+_ORDER_TEMPLATE = {
+    "order_number": 1001,
+    "total_price": "99.99",
+    "currency": "USD",
+    "financial_status": "paid",
+    "line_items": (
+        {"id": "item1", "title": "Widget", "quantity": 1, "price": "99.99"},
+    ),
+}
+
+
+@dataclass(slots=True)
+class _OrderFixture:
+    """Shape of a mock Shopify order; ``as_payload`` builds the API body."""
+
+    order_id: str = "12345"
+    days_ago: int = 5
+    fulfillment_status: str = "fulfilled"
+
+    def as_payload(self) -> dict:
+        return {
+            "order": {
+                **_ORDER_TEMPLATE,
+                "id": self.order_id,
+                "created_at": _created_at(self.days_ago),
+                "fulfillment_status": self.fulfillment_status,
+            }
         }
-    }
 
 
 # ---------------------------------------------------------------------------
@@ -56,12 +141,10 @@ def _recent_order(order_id: str = "12345", days_ago: int = 5) -> dict:
 # ---------------------------------------------------------------------------
 
 
-def test_get_order_success(mocker):
+def test_get_order_success(httpx_get):
     """get_order returns parsed order details on 200."""
-    from integrations.tools.shopify_tools import get_order
-
-    mock_resp = _make_httpx_response(_recent_order("12345"))
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
+    mock_resp = _make_httpx_response(_OrderFixture("12345").as_payload())
+    httpx_get.return_value = mock_resp
 
     result = get_order.invoke({"order_id": "12345"})
 
@@ -73,8 +156,6 @@ def test_get_order_success(mocker):
 
 def test_get_order_missing_config(monkeypatch):
     """Returns error dict when Shopify is not configured."""
-    from integrations.tools.shopify_tools import get_order
-
     monkeypatch.setattr(settings, "shopify_api_key", "")
 
     result = get_order.invoke({"order_id": "12345"})
@@ -86,10 +167,8 @@ def test_get_order_missing_config(monkeypatch):
 # ---------------------------------------------------------------------------
 
 
-def test_search_orders_success(mocker):
+def test_search_orders_success(httpx_get):
     """search_orders returns a list of order summaries."""
-    from integrations.tools.shopify_tools import search_orders
-
     shopify_response = {
         "orders": [
             {
@@ -111,7 +190,7 @@ def test_search_orders_success(mocker):
         ]
     }
     mock_resp = _make_httpx_response(shopify_response)
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
+    httpx_get.return_value = mock_resp
 
     results = search_orders.invoke({"customer_email": "customer@example.com"})
 
@@ -126,10 +205,8 @@ def test_search_orders_success(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_create_refund_success(mocker):
+def test_create_refund_success(httpx_post):
     """create_refund posts to Shopify and returns refund details."""
-    from integrations.tools.shopify_tools import create_refund
-
     refund_response = {
         "refund": {
             "id": "ref_999",
@@ -140,9 +217,7 @@ def test_create_refund_success(mocker):
         }
     }
     mock_resp = _make_httpx_response(refund_response)
-    mock_post = mocker.patch(
-        "integrations.tools.shopify_tools.httpx.post", return_value=mock_resp
-    )
+    httpx_post.return_value = mock_resp
 
     result = create_refund.invoke(
         {"order_id": "12345", "amount": 49.99, "reason": "customer_request"}
@@ -151,7 +226,7 @@ def test_create_refund_success(mocker):
     assert result["id"] == "ref_999"
     assert result["order_id"] == "12345"
     assert len(result["transactions"]) == 1
-    mock_post.assert_called_once()
+    httpx_post.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -159,44 +234,26 @@ def test_create_refund_success(mocker):
 # ---------------------------------------------------------------------------
 
 
-def test_check_return_eligibility_eligible(mocker):
-    """Orders fulfilled within 30 days should be eligible for return."""
-    from integrations.tools.shopify_tools import check_return_eligibility
-
-    mock_resp = _make_httpx_response(_recent_order("12345", days_ago=10))
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
-
-    result = check_return_eligibility.invoke({"order_id": "12345"})
-
-    assert result["eligible"] is True
-    assert result["days_since_order"] <= 30
-
-
-def test_check_return_eligibility_outside_window(mocker):
-    """Orders older than 30 days should not be eligible."""
-    from integrations.tools.shopify_tools import check_return_eligibility
-
-    mock_resp = _make_httpx_response(_recent_order("99999", days_ago=45))
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
+@pytest.mark.parametrize(
+    "order, expected_eligible",
+    [
+        pytest.param(_OrderFixture("12345", days_ago=10), True, id="within-window"),
+        pytest.param(_OrderFixture("99999", days_ago=45), False, id="outside-window"),
+        pytest.param(
+            _OrderFixture("77777", days_ago=2, fulfillment_status="unfulfilled"),
+            False,
+            id="unfulfilled",
+        ),
+    ],
+)
+def test_check_return_eligibility(httpx_get, frozen_clock, order, expected_eligible):
+    """Only fulfilled orders inside the 30-day window are eligible for return."""
+    httpx_get.return_value = _make_httpx_response(order.as_payload())
 
-    result = check_return_eligibility.invoke({"order_id": "99999"})
+    result = check_return_eligibility.invoke({"order_id": order.order_id})
 
-    assert result["eligible"] is False
-    assert result["days_since_order"] > 30
-
-
-def test_check_return_eligibility_unfulfilled(mocker):
-    """Unfulfilled orders should not be eligible for return."""
-    from integrations.tools.shopify_tools import check_return_eligibility
-
-    order = _recent_order("77777", days_ago=2)
-    order["order"]["fulfillment_status"] = "unfulfilled"
-    mock_resp = _make_httpx_response(order)
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
-
-    result = check_return_eligibility.invoke({"order_id": "77777"})
-
-    assert result["eligible"] is False
+    assert result["eligible"] is expected_eligible
+    assert result["days_since_order"] == order.days_ago
 
 
 # ---------------------------------------------------------------------------
@@ -205,8 +262,6 @@ def test_check_return_eligibility_unfulfilled(mocker):
 
 
 def _http_status_error(status_code: int = 404, body: str = "Not Found"):
-    import httpx
-
     mock_response = MagicMock()
     mock_response.status_code = status_code
     mock_response.text = body
@@ -218,91 +273,77 @@ def _http_status_error(status_code: int = 404, body: str = "Not Found"):
 
 
 def _http_error(msg: str = "connection error"):
-    import httpx
-
     return httpx.HTTPError(msg)
 
 
-def test_get_order_http_status_error(mocker):
-    """get_order returns error dict on HTTPStatusError."""
-    from integrations.tools.shopify_tools import get_order
-
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.get",
-        side_effect=_http_status_error(404, "Not Found"),
-    )
-    result = get_order.invoke({"order_id": "bad_id"})
+@pytest.mark.parametrize(
+    "tool_fn, tool_input, exc, expected_status",
+    [
+        pytest.param(
+            get_order,
+            {"order_id": "bad_id"},
+            _http_status_error(404, "Not Found"),
+            "404",
+            id="get-order-status-404",
+        ),
+        pytest.param(
+            get_order,
+            {"order_id": "bad_id"},
+            _http_error("timeout"),
+            None,
+            id="get-order-network",
+        ),
+        pytest.param(
+            search_orders,
+            {"customer_email": "x@y.com"},
+            _http_status_error(403, "Forbidden"),
+            None,
+            id="search-status-403",
+        ),
+        pytest.param(
+            search_orders,
+            {"customer_email": "x@y.com"},
+            _http_error("dns failure"),
+            None,
+            id="search-network",
+        ),
+    ],
+)
+def test_get_tool_returns_error_on_http_failure(
+    httpx_get, tool_fn, tool_input, exc, expected_status
+):
+    """GET-based tools turn HTTPStatusError / network HTTPError into an error payload."""
+    httpx_get.side_effect = exc
+    result = tool_fn.invoke(tool_input)
+
+    # search_orders returns a list of results; get_order returns a dict
+    if tool_fn is search_orders:
+        assert isinstance(result, list)
+        result = result[0]
     assert "error" in result
-    assert "404" in result["error"]
-
-
-def test_get_order_http_error(mocker):
-    """get_order returns error dict on network error."""
-    from integrations.tools.shopify_tools import get_order
-
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.get",
-        side_effect=_http_error("timeout"),
-    )
-    result = get_order.invoke({"order_id": "bad_id"})
-    assert "error" in result
-
-
-def test_search_orders_http_status_error(mocker):
-    """search_orders returns error list on HTTPStatusError."""
-    from integrations.tools.shopify_tools import search_orders
-
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.get",
-        side_effect=_http_status_error(403, "Forbidden"),
-    )
-    result = search_orders.invoke({"customer_email": "x@y.com"})
-    assert isinstance(result, list)
-    assert "error" in result[0]
-
-
-def test_search_orders_http_error(mocker):
-    """search_orders returns error list on network error."""
-    from integrations.tools.shopify_tools import search_orders
-
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.get",
-        side_effect=_http_error("dns failure"),
-    )
-    result = search_orders.invoke({"customer_email": "x@y.com"})
-    assert isinstance(result, list)
-    assert "error" in result[0]
-
-
-def test_create_refund_http_status_error(mocker):
-    """create_refund returns error dict on HTTPStatusError."""
-    from integrations.tools.shopify_tools import create_refund
-
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.post",
-        side_effect=_http_status_error(422, "Unprocessable"),
-    )
+    if expected_status is not None:
+        assert expected_status in result["error"]
+
+
+@pytest.mark.parametrize(
+    "exc, expected_status",
+    [
+        pytest.param(_http_status_error(422, "Unprocessable"), "422", id="status-422"),
+        pytest.param(_http_error("connection refused"), None, id="network"),
+    ],
+)
+def test_create_refund_returns_error_on_http_failure(httpx_post, exc, expected_status):
+    """create_refund turns HTTPStatusError / network HTTPError into an error dict."""
+    httpx_post.side_effect = exc
     result = create_refund.invoke({"order_id": "bad", "amount": 10.0})
-    assert "error" in result
-    assert "422" in result["error"]
-
-
-def test_create_refund_http_error(mocker):
-    """create_refund returns error dict on network error."""
-    from integrations.tools.shopify_tools import create_refund
 
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.post",
-        side_effect=_http_error("connection refused"),
-    )
-    result = create_refund.invoke({"order_id": "bad", "amount": 10.0})
     assert "error" in result
+    if expected_status is not None:
+        assert expected_status in result["error"]
 
 
 def test_create_refund_missing_config(monkeypatch):
     """Returns error dict when Shopify is not configured."""
-    from integrations.tools.shopify_tools import create_refund
-
     monkeypatch.setattr(settings, "shopify_api_key", "")
 
     result = create_refund.invoke({"order_id": "111", "amount": 5.0})
@@ -311,8 +352,6 @@ def test_create_refund_missing_config(monkeypatch):
 
 def test_search_orders_missing_config(monkeypatch):
     """Returns error list when Shopify is not configured."""
-    from integrations.tools.shopify_tools import search_orders
-
     monkeypatch.setattr(settings, "shopify_shop_url", "")
 
     result = search_orders.invoke({"customer_email": "x@y.com"})
@@ -320,22 +359,15 @@ def test_search_orders_missing_config(monkeypatch):
     assert "error" in result[0]
 
 
-def test_check_return_eligibility_propagates_order_error(mocker):
+def test_check_return_eligibility_propagates_order_error(httpx_get):
     """Returns error dict when get_order itself fails (e.g. not configured)."""
-    from integrations.tools.shopify_tools import check_return_eligibility
-
-    mocker.patch(
-        "integrations.tools.shopify_tools.httpx.get",
-        side_effect=_http_status_error(404, "Not Found"),
-    )
+    httpx_get.side_effect = _http_status_error(404, "Not Found")
     result = check_return_eligibility.invoke({"order_id": "missing"})
     assert "error" in result
 
 
-def test_check_return_eligibility_invalid_date(mocker):
+def test_check_return_eligibility_invalid_date(httpx_get):
     """Returns error dict when order date cannot be parsed."""
-    from integrations.tools.shopify_tools import check_return_eligibility
-
     bad_order = {
         "order": {
             "id": "55555",
@@ -349,7 +381,7 @@ def test_check_return_eligibility_invalid_date(mocker):
         }
     }
     mock_resp = _make_httpx_response(bad_order)
-    mocker.patch("integrations.tools.shopify_tools.httpx.get", return_value=mock_resp)
+    httpx_get.return_value = mock_resp
 
     result = check_return_eligibility.invoke({"order_id": "55555"})
     assert "error" in result
@@ -5,17 +5,31 @@ All Stripe API calls are mocked — no real Stripe credentials required.
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
-import stripe
+from types import SimpleNamespace
+from unittest.mock import patch
+from stripe import StripeError
+
+from integrations.tools.stripe_tools import (
+    cancel_subscription,
+    create_payment_intent,
+    get_customer_info,
+    get_invoice,
+    get_subscription,
+    list_customer_invoices,
+    stripe_tools,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
-def _stripe_error(msg: str = "stripe error") -> stripe.error.StripeError:
-    err = stripe.error.StripeError(msg)
-    return err
+def _stripe_error(msg: str = "stripe error") -> StripeError:
+    return StripeError(msg)
+
+
+# Shared by the error-path tests; only its type matters to the tools.
+_STRIPE_ERROR = _stripe_error()
 
 
 # ---------------------------------------------------------------------------
@@ -23,49 +37,35 @@ def _stripe_error(msg: str = "stripe error") -> stripe.error.StripeError:
 # ---------------------------------------------------------------------------
 
 
-class TestGetCustomerInfo:
-    def _call(self, customer_id: str):
-        from integrations.tools.stripe_tools import get_customer_info
-
-        return get_customer_info.invoke({"customer_id": customer_id})
-
-    def test_returns_customer_fields(self):
-        mock_customer = MagicMock()
-        mock_customer.id = "cus_123"
-        mock_customer.email = "user@example.com"
-        mock_customer.name = "Alice"
-        mock_customer.balance = 0
-        mock_customer.currency = "usd"
-        mock_customer.created = 1700000000
-        mock_customer.subscriptions.data = [MagicMock(id="sub_abc")]
-
-        with patch("stripe.Customer.retrieve", return_value=mock_customer):
-            result = self._call("cus_123")
-
-        assert result["id"] == "cus_123"
-        assert result["email"] == "user@example.com"
-        assert result["subscriptions"] == ["sub_abc"]
-
-    def test_no_subscriptions_returns_empty_list(self):
-        mock_customer = MagicMock()
-        mock_customer.id = "cus_456"
-        mock_customer.email = "b@b.com"
-        mock_customer.name = "Bob"
-        mock_customer.balance = 0
-        mock_customer.currency = "usd"
-        mock_customer.created = 1700000001
-        mock_customer.subscriptions = None
-
-        with patch("stripe.Customer.retrieve", return_value=mock_customer):
-            result = self._call("cus_456")
-
-        assert result["subscriptions"] == []
-
-    def test_stripe_error_returns_error_dict(self):
-        with patch("stripe.Customer.retrieve", side_effect=_stripe_error("not found")):
-            result = self._call("cus_bad")
-
-        assert "error" in result
+@pytest.mark.parametrize(
+    "customer_id, subscriptions, expected_subscriptions",
+    [
+        pytest.param(
+            "cus_123",
+            SimpleNamespace(data=(SimpleNamespace(id="sub_abc"),)),
+            ["sub_abc"],
+            id="with-subscriptions",
+        ),
+        pytest.param("cus_456", None, [], id="no-subscriptions"),
+    ],
+)
+def test_get_customer_info(customer_id, subscriptions, expected_subscriptions):
+    mock_customer = SimpleNamespace(
+        id=customer_id,
+        email="user@example.com",
+        name="Alice",
+        balance=0,
+        currency="usd",
+        created=1700000000,
+        subscriptions=subscriptions,
+    )
+
+    with patch("stripe.Customer.retrieve", return_value=mock_customer):
+        result = get_customer_info.invoke({"customer_id": customer_id})
+
+    assert result["id"] == customer_id
+    assert result["email"] == "user@example.com"
+    assert result["subscriptions"] == expected_subscriptions
 
 
 # ---------------------------------------------------------------------------
@@ -73,132 +73,90 @@ class TestGetCustomerInfo:
 # ---------------------------------------------------------------------------
 
 
-class TestGetInvoice:
-    def _call(self, invoice_id: str):
-        from integrations.tools.stripe_tools import get_invoice
-
-        return get_invoice.invoke({"invoice_id": invoice_id})
-
-    def test_returns_invoice_fields(self):
-        mock_invoice = MagicMock()
-        mock_invoice.id = "in_001"
-        mock_invoice.number = "INV-001"
-        mock_invoice.amount_due = 4900
-        mock_invoice.amount_paid = 0
-        mock_invoice.currency = "usd"
-        mock_invoice.status = "open"
-        mock_invoice.due_date = 1700100000
-        mock_invoice.hosted_invoice_url = "https://invoice.stripe.com/1"
+def test_get_invoice_returns_invoice_fields():
+    mock_invoice = SimpleNamespace(
+        id="in_001",
+        number="INV-001",
+        amount_due=4900,
+        amount_paid=0,
+        currency="usd",
+        status="open",
+        due_date=1700100000,
+        hosted_invoice_url="https://invoice.stripe.com/1",
+    )
 
-        with patch("stripe.Invoice.retrieve", return_value=mock_invoice):
-            result = self._call("in_001")
+    with patch("stripe.Invoice.retrieve", return_value=mock_invoice):
+        result = get_invoice.invoke({"invoice_id": "in_001"})
 
-        assert result["id"] == "in_001"
-        assert result["amount_due"] == 4900
-        assert result["status"] == "open"
-
-    def test_stripe_error_returns_error_dict(self):
-        with patch("stripe.Invoice.retrieve", side_effect=_stripe_error()):
-            result = self._call("in_bad")
-
-        assert "error" in result
+    assert result["id"] == "in_001"
+    assert result["amount_due"] == 4900
+    assert result["status"] == "open"
 
 
 # ---------------------------------------------------------------------------
 # list_customer_invoices
 # ---------------------------------------------------------------------------
 
-
-class TestListCustomerInvoices:
-    def _call(self, customer_id: str, limit: int = 10):
-        from integrations.tools.stripe_tools import list_customer_invoices
-
-        return list_customer_invoices.invoke(
-            {"customer_id": customer_id, "limit": limit}
-        )
-
-    def test_returns_list_of_invoice_summaries(self):
-        mock_inv = MagicMock()
-        mock_inv.id = "in_002"
-        mock_inv.number = "INV-002"
-        mock_inv.amount_due = 2900
-        mock_inv.status = "paid"
-        mock_inv.created = 1700000002
-
-        mock_list = MagicMock()
-        mock_list.data = [mock_inv]
-
-        with patch("stripe.Invoice.list", return_value=mock_list):
-            result = self._call("cus_789")
-
-        assert len(result) == 1
-        assert result[0]["id"] == "in_002"
+_INVOICE_SUMMARY = SimpleNamespace(
+    id="in_002",
+    number="INV-002",
+    amount_due=2900,
+    status="paid",
+    created=1700000002,
+)
+
+
+@pytest.mark.parametrize(
+    "invoices, expected_ids",
+    [
+        pytest.param((_INVOICE_SUMMARY,), ["in_002"], id="one-invoice"),
+        pytest.param((), [], id="empty"),
+    ],
+)
+def test_list_customer_invoices(invoices, expected_ids):
+    mock_list = SimpleNamespace(data=invoices)
+
+    with patch("stripe.Invoice.list", return_value=mock_list):
+        result = list_customer_invoices.invoke({"customer_id": "cus_789", "limit": 10})
+
+    assert [inv["id"] for inv in result] == expected_ids
+    if result:
         assert result[0]["status"] == "paid"
 
-    def test_empty_list(self):
-        mock_list = MagicMock()
-        mock_list.data = []
-
-        with patch("stripe.Invoice.list", return_value=mock_list):
-            result = self._call("cus_empty")
-
-        assert result == []
-
-    def test_stripe_error_returns_list_with_error(self):
-        with patch("stripe.Invoice.list", side_effect=_stripe_error()):
-            result = self._call("cus_bad")
-
-        assert isinstance(result, list)
-        assert "error" in result[0]
-
 
 # ---------------------------------------------------------------------------
 # get_subscription
 # ---------------------------------------------------------------------------
 
 
-class TestGetSubscription:
-    def _call(self, subscription_id: str):
-        from integrations.tools.stripe_tools import get_subscription
-
-        return get_subscription.invoke({"subscription_id": subscription_id})
-
-    def test_returns_subscription_fields(self):
-        mock_sub = MagicMock()
-        mock_sub.id = "sub_001"
-        mock_sub.status = "active"
-        mock_sub.current_period_start = 1700000000
-        mock_sub.current_period_end = 1702678400
-        mock_sub.plan.nickname = "Pro Monthly"
-        mock_sub.plan.amount = 4900
-        mock_sub.plan.currency = "usd"
-
-        with patch("stripe.Subscription.retrieve", return_value=mock_sub):
-            result = self._call("sub_001")
-
-        assert result["id"] == "sub_001"
-        assert result["status"] == "active"
-        assert result["plan"] == "Pro Monthly"
-
-    def test_no_plan_returns_none_fields(self):
-        mock_sub = MagicMock()
-        mock_sub.id = "sub_002"
-        mock_sub.status = "canceled"
-        mock_sub.current_period_start = 0
-        mock_sub.current_period_end = 0
-        mock_sub.plan = None
-
-        with patch("stripe.Subscription.retrieve", return_value=mock_sub):
-            result = self._call("sub_002")
-
-        assert result["plan"] is None
-        assert result["amount"] == 0
-
-    def test_stripe_error_returns_error_dict(self):
-        with patch("stripe.Subscription.retrieve", side_effect=_stripe_error()):
-            result = self._call("sub_bad")
-
-        assert "error" in result
+@pytest.mark.parametrize(
+    "plan, expected_plan, expected_amount",
+    [
+        pytest.param(
+            SimpleNamespace(nickname="Pro Monthly", amount=4900, currency="usd"),
+            "Pro Monthly",
+            4900,
+            id="with-plan",
+        ),
+        pytest.param(None, None, 0, id="no-plan"),
+    ],
+)
+def test_get_subscription(plan, expected_plan, expected_amount):
+    mock_sub = SimpleNamespace(
+        id="sub_001",
+        status="active",
+        current_period_start=1700000000,
+        current_period_end=1702678400,
+        plan=plan,
+    )
+
+    with patch("stripe.Subscription.retrieve", return_value=mock_sub):
+        result = get_subscription.invoke({"subscription_id": "sub_001"})
+
+    assert result["id"] == "sub_001"
+    assert result["status"] == "active"
+    assert result["plan"] == expected_plan
+    assert result["amount"] == expected_amount
 
 
 # ---------------------------------------------------------------------------
@@ -206,45 +164,37 @@ class TestGetSubscription:
 # ---------------------------------------------------------------------------
 
 
-class TestCancelSubscription:
-    def _call(self, subscription_id: str, at_period_end: bool = True):
-        from integrations.tools.stripe_tools import cancel_subscription
-
-        return cancel_subscription.invoke(
-            {"subscription_id": subscription_id, "at_period_end": at_period_end}
+@pytest.mark.parametrize(
+    "at_period_end, patch_target, expected_call",
+    [
+        pytest.param(
+            True,
+            "stripe.Subscription.modify",
+            (("sub_x",), {"cancel_at_period_end": True}),
+            id="at-period-end-modifies",
+        ),
+        pytest.param(
+            False,
+            "stripe.Subscription.cancel",
+            (("sub_x",), {}),
+            id="immediately-cancels",
+        ),
+    ],
+)
+def test_cancel_subscription(at_period_end, patch_target, expected_call):
+    mock_sub = SimpleNamespace(
+        id="sub_x", status="canceled", cancel_at=None, canceled_at=1700000999
+    )
+
+    with patch(patch_target, return_value=mock_sub) as mock_api:
+        result = cancel_subscription.invoke(
+            {"subscription_id": "sub_x", "at_period_end": at_period_end}
         )
 
-    def test_cancel_at_period_end_calls_modify(self):
-        mock_sub = MagicMock()
-        mock_sub.id = "sub_cancel"
-        mock_sub.status = "active"
-        mock_sub.cancel_at = 1702678400
-        mock_sub.canceled_at = None
-
-        with patch("stripe.Subscription.modify", return_value=mock_sub) as mock_mod:
-            result = self._call("sub_cancel", at_period_end=True)
-
-        mock_mod.assert_called_once_with("sub_cancel", cancel_at_period_end=True)
-        assert result["id"] == "sub_cancel"
-
-    def test_cancel_immediately_calls_cancel(self):
-        mock_sub = MagicMock()
-        mock_sub.id = "sub_now"
-        mock_sub.status = "canceled"
-        mock_sub.cancel_at = None
-        mock_sub.canceled_at = 1700000999
-
-        with patch("stripe.Subscription.cancel", return_value=mock_sub) as mock_del:
-            result = self._call("sub_now", at_period_end=False)
-
-        mock_del.assert_called_once_with("sub_now")
-        assert result["status"] == "canceled"
-
-    def test_stripe_error_returns_error_dict(self):
-        with patch("stripe.Subscription.modify", side_effect=_stripe_error()):
-            result = self._call("sub_bad")
-
-        assert "error" in result
+    args, kwargs = expected_call
+    mock_api.assert_called_once_with(*args, **kwargs)
+    assert result["id"] == "sub_x"
+    assert result["status"] == "canceled"
 
 
 # ---------------------------------------------------------------------------
@@ -252,35 +202,80 @@ class TestCancelSubscription:
 # ---------------------------------------------------------------------------
 
 
-class TestCreatePaymentIntent:
-    def _call(self, amount: int, currency: str, customer_id: str):
-        from integrations.tools.stripe_tools import create_payment_intent
+def test_create_payment_intent_returns_payment_intent_fields():
+    mock_intent = SimpleNamespace(
+        id="pi_001",
+        client_secret="pi_001_secret_abc",
+        amount=4900,
+        status="requires_payment_method",
+    )
 
-        return create_payment_intent.invoke(
-            {"amount": amount, "currency": currency, "customer_id": customer_id}
+    with patch("stripe.PaymentIntent.create", return_value=mock_intent):
+        result = create_payment_intent.invoke(
+            {"amount": 4900, "currency": "usd", "customer_id": "cus_abc"}
         )
 
-    def test_returns_payment_intent_fields(self):
-        mock_intent = MagicMock()
-        mock_intent.id = "pi_001"
-        mock_intent.client_secret = "pi_001_secret_abc"
-        mock_intent.amount = 4900
-        mock_intent.status = "requires_payment_method"
+    assert result["id"] == "pi_001"
+    assert result["client_secret"] == "pi_001_secret_abc"
+    assert result["amount"] == 4900
 
-        with patch("stripe.PaymentIntent.create", return_value=mock_intent):
-            result = self._call(4900, "usd", "cus_abc")
 
-        assert result["id"] == "pi_001"
-        assert result["client_secret"] == "pi_001_secret_abc"
-        assert result["amount"] == 4900
+# ---------------------------------------------------------------------------
+# StripeError paths
+# ---------------------------------------------------------------------------
 
-    def test_stripe_error_returns_error_dict(self):
-        with patch(
-            "stripe.PaymentIntent.create", side_effect=_stripe_error("card_declined")
-        ):
-            result = self._call(100, "usd", "cus_bad")
 
-        assert "error" in result
+@pytest.mark.parametrize(
+    "patch_target, tool_fn, tool_input",
+    [
+        pytest.param(
+            "stripe.Customer.retrieve",
+            get_customer_info,
+            {"customer_id": "cus_bad"},
+            id="get_customer_info",
+        ),
+        pytest.param(
+            "stripe.Invoice.retrieve",
+            get_invoice,
+            {"invoice_id": "in_bad"},
+            id="get_invoice",
+        ),
+        pytest.param(
+            "stripe.Invoice.list",
+            list_customer_invoices,
+            {"customer_id": "cus_bad", "limit": 10},
+            id="list_customer_invoices",
+        ),
+        pytest.param(
+            "stripe.Subscription.retrieve",
+            get_subscription,
+            {"subscription_id": "sub_bad"},
+            id="get_subscription",
+        ),
+        pytest.param(
+            "stripe.Subscription.modify",
+            cancel_subscription,
+            {"subscription_id": "sub_bad", "at_period_end": True},
+            id="cancel_subscription",
+        ),
+        pytest.param(
+            "stripe.PaymentIntent.create",
+            create_payment_intent,
+            {"amount": 100, "currency": "usd", "customer_id": "cus_bad"},
+            id="create_payment_intent",
+        ),
+    ],
+)
+def test_stripe_tool_returns_error_on_stripe_error(patch_target, tool_fn, tool_input):
+    """Stripe tools turn a StripeError into an error payload instead of raising."""
+    with patch(patch_target, side_effect=_STRIPE_ERROR):
+        result = tool_fn.invoke(tool_input)
+
+    # list_customer_invoices returns a list of results; the others return a dict
+    if tool_fn is list_customer_invoices:
+        assert isinstance(result, list)
+        result = result[0]
+    assert "error" in result
 
 
 # ---------------------------------------------------------------------------
@@ -289,6 +284,4 @@ class TestCreatePaymentIntent:
 
 
 def test_stripe_tools_list_has_six_entries():
-    from integrations.tools.stripe_tools import stripe_tools
-
     assert len(stripe_tools) == 6
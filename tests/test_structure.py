@@ -2,14 +2,45 @@
 Basic structure tests to validate the codebase organization.
 """
 
+import importlib.util
 import os
+import re
 import pytest
+import yaml
+from functools import lru_cache
 from pathlib import Path
 
+# Repository root, resolved once for every test in this module.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+KEY_DEPENDENCIES = frozenset({"langgraph", "langchain", "azure", "fastapi"})
+# One bytes alternation, so requirements.txt is scanned once, undecoded.
+_KEY_DEPENDENCY_RE = re.compile(
+    "|".join(sorted(KEY_DEPENDENCIES)).encode(), re.IGNORECASE
+)
+
+
+# Several tests probe the same paths; stat each one once per session.
+@lru_cache(maxsize=None)
+def _exists(path: str) -> bool:
+    return Path(path).exists()
+
+
+@lru_cache(maxsize=None)
+def _is_dir(path: str) -> bool:
+    return Path(path).is_dir()
+
+
+@lru_cache(maxsize=None)
+def _dir_entries(path: str) -> dict:
+    """Map entry name -> is_file for one directory, from a single scandir."""
+    with os.scandir(path) as it:
+        return {entry.name: entry.is_file() for entry in it}
+
 
 def test_project_structure():
     """Test that all required directories exist."""
-    base_dir = Path(__file__).parent.parent
+    base_dir = BASE_DIR
 
     required_dirs = [
         "agents",
@@ -23,151 +54,114 @@ def test_project_structure():
 
     for dir_name in required_dirs:
         dir_path = base_dir / dir_name
-        assert dir_path.exists(), f"Required directory {dir_name} not found"
-        assert dir_path.is_dir(), f"{dir_name} is not a directory"
-
-
-def test_agent_files_exist():
-    """Test that all agent files exist."""
-    base_dir = Path(__file__).parent.parent / "agents"
-
-    required_files = [
-        "__init__.py",
-        "billing_agent.py",
-        "tech_agent.py",
-        "returns_agent.py",
-        "registry.yaml",
-    ]
-
-    for file_name in required_files:
-        file_path = base_dir / file_name
-        assert file_path.exists(), f"Required file {file_name} not found in agents/"
-        assert file_path.is_file(), f"{file_name} is not a file"
-
-
-def test_orchestrator_files_exist():
-    """Test that orchestrator files exist."""
-    base_dir = Path(__file__).parent.parent / "orchestrator"
-
-    required_files = [
-        "__init__.py",
-        "graph.py",
-        "supervisor.py",
-        "verifier.py",
-        "escalator.py",
-        "custom_answers.py",
-    ]
-
-    for file_name in required_files:
-        file_path = base_dir / file_name
-        assert (
-            file_path.exists()
-        ), f"Required file {file_name} not found in orchestrator/"
-
-
-def test_integration_files_exist():
-    """Test that integration files exist."""
-    base_dir = Path(__file__).parent.parent / "integrations"
-
-    required_files = ["__init__.py", "intercom.py", "conversations.py"]
+        assert _exists(str(dir_path)), f"Required directory {dir_name} not found"
+        assert _is_dir(str(dir_path)), f"{dir_name} is not a directory"
+
+
+REQUIRED_FILES = [
+    ("agents", "__init__.py"),
+    ("agents", "billing_agent.py"),
+    ("agents", "tech_agent.py"),
+    ("agents", "returns_agent.py"),
+    ("agents", "registry.yaml"),
+    ("integrations", "__init__.py"),
+    ("integrations", "intercom.py"),
+    ("integrations", "conversations.py"),
+    ("integrations/tools", "stripe_tools.py"),
+    ("integrations/tools", "jira_tools.py"),
+    ("integrations/tools", "shopify_tools.py"),
+    (".", "requirements.txt"),
+    (".", ".gitignore"),
+    (".", "README.md"),
+    (".", "function_app.py"),
+    (".", "host.json"),
+    (".", ".funcignore"),
+    ("infra", "main.tf"),
+    ("infra", "README.md"),
+    (".github/workflows", "ci-cd.yml"),
+    ("docs", "DEPLOYMENT.md"),
+    ("docs", "ARCHITECTURE.md"),
+]
+
+REQUIRED_MODULES = [
+    "orchestrator",
+    "orchestrator.graph",
+    "orchestrator.supervisor",
+    "orchestrator.verifier",
+    "orchestrator.escalator",
+    "orchestrator.custom_answers",
+    "shared",
+    "shared.config",
+    "shared.memory",
+    "shared.rag",
+    "shared.telemetry",
+]
+
+
+@pytest.mark.parametrize(
+    "subdir, file_name",
+    [pytest.param(*entry, id=f"{entry[0]}/{entry[1]}") for entry in REQUIRED_FILES],
+)
+def test_required_file_exists(subdir, file_name):
+    """Test that a required file exists; each directory is listed only once."""
+    dir_path = BASE_DIR / subdir
+    assert _is_dir(str(dir_path)), f"Required directory {subdir}/ not found"
+
+    entries = _dir_entries(str(dir_path))
+    assert file_name in entries, f"Required file {file_name} not found in {subdir}/"
+    assert entries[file_name], f"{file_name} is not a file"
+
+
+@pytest.mark.parametrize("module_name", REQUIRED_MODULES)
+def test_required_module_exists(module_name):
+    """Test that orchestrator and shared modules resolve to source files."""
+    # find_spec resolves through the import system's cached directory listings
+    spec = importlib.util.find_spec(module_name)
+    assert spec is not None, f"Required module {module_name} not found"
+    assert spec.origin, f"{module_name} has no source file"
 
-    for file_name in required_files:
-        file_path = base_dir / file_name
-        assert (
-            file_path.exists()
-        ), f"Required file {file_name} not found in integrations/"
-
-    # Check tools directory
-    tools_dir = base_dir / "tools"
-    assert tools_dir.exists()
-    assert (tools_dir / "stripe_tools.py").exists()
-    assert (tools_dir / "jira_tools.py").exists()
-    assert (tools_dir / "shopify_tools.py").exists()
-
-
-def test_shared_files_exist():
-    """Test that shared files exist."""
-    base_dir = Path(__file__).parent.parent / "shared"
-
-    required_files = ["__init__.py", "config.py", "memory.py", "rag.py", "telemetry.py"]
-
-    for file_name in required_files:
-        file_path = base_dir / file_name
-        assert file_path.exists(), f"Required file {file_name} not found in shared/"
-
-
-def test_config_files_exist():
-    """Test that configuration files exist."""
-    base_dir = Path(__file__).parent.parent
-
-    required_files = [
-        "requirements.txt",
-        ".gitignore",
-        "README.md",
-        "function_app.py",
-        "host.json",
-        ".funcignore",
-    ]
-
-    for file_name in required_files:
-        file_path = base_dir / file_name
-        assert file_path.exists(), f"Required file {file_name} not found"
-
-
-def test_infrastructure_files_exist():
-    """Test that infrastructure files exist."""
-    base_dir = Path(__file__).parent.parent / "infra"
-
-    assert (base_dir / "main.tf").exists()
-    assert (base_dir / "README.md").exists()
-
-
-def test_cicd_workflow_exists():
-    """Test that CI/CD workflow exists."""
-    workflow_path = Path(__file__).parent.parent / ".github" / "workflows" / "ci-cd.yml"
-    assert workflow_path.exists()
 
+def test_requirements_has_content():
+    """Test that requirements.txt has content."""
+    req_file = BASE_DIR / "requirements.txt"
+    content = req_file.read_bytes()
 
-def test_documentation_exists():
-    """Test that documentation files exist."""
-    docs_dir = Path(__file__).parent.parent / "docs"
+    # Check for key dependencies
+    found = {match.lower().decode() for match in _KEY_DEPENDENCY_RE.findall(content)}
+    missing = sorted(KEY_DEPENDENCIES - found)
+    assert not missing, f"requirements.txt is missing {missing}"
 
-    assert docs_dir.exists()
-    assert (docs_dir / "DEPLOYMENT.md").exists()
-    assert (docs_dir / "ARCHITECTURE.md").exists()
 
+@pytest.fixture(scope="session")
+def registry_yaml():
+    """agents/registry.yaml, parsed once per session."""
+    return yaml.safe_load((BASE_DIR / "agents" / "registry.yaml").read_text())
 
-def test_requirements_has_content():
-    """Test that requirements.txt has content."""
-    req_file = Path(__file__).parent.parent / "requirements.txt"
-    content = req_file.read_text()
 
-    # Check for key dependencies
-    assert "langgraph" in content.lower()
-    assert "langchain" in content.lower()
-    assert "azure" in content.lower()
-    assert "fastapi" in content.lower()
+@pytest.fixture(scope="session")
+def custom_answers_yaml():
+    """agents/custom_answers.yaml, parsed once per session."""
+    ca_file = BASE_DIR / "agents" / "custom_answers.yaml"
+    assert _exists(str(ca_file)), "agents/custom_answers.yaml not found"
+    return yaml.safe_load(ca_file.read_text())
 
 
-def test_registry_yaml_valid():
+def test_registry_yaml_valid(registry_yaml):
     """Test that registry.yaml exists and has content."""
-    registry_file = Path(__file__).parent.parent / "agents" / "registry.yaml"
-    content = registry_file.read_text()
+    registry = registry_yaml["registry"]
 
     # Check for agent registrations
-    assert "billing" in content
-    assert "technical" in content
-    assert "returns" in content
+    assert "billing" in registry
+    assert "technical" in registry
+    assert "returns" in registry
 
 
-def test_custom_answers_yaml_valid():
+def test_custom_answers_yaml_valid(custom_answers_yaml):
     """Test that custom_answers.yaml exists and has valid entries."""
-    ca_file = Path(__file__).parent.parent / "agents" / "custom_answers.yaml"
-    assert ca_file.exists(), "agents/custom_answers.yaml not found"
-    content = ca_file.read_text()
-    assert "custom_answers" in content
-    assert "patterns" in content
-    assert "answer" in content
+    entries = custom_answers_yaml["custom_answers"]
+    assert entries
+    assert all("patterns" in entry for entry in entries)
+    assert all("answer" in entry for entry in entries)
 
 
 if __name__ == "__main__":
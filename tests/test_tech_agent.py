@@ -6,8 +6,11 @@ Creates a fresh agent with mocked LLM and mocked Jira HTTP calls for each test.
 
 import json
 import pytest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+from agents import tech_agent
+from agents.tech_agent import create_tech_agent
 from shared.config import settings
 
 # ---------------------------------------------------------------------------
@@ -16,11 +19,31 @@ from shared.config import settings
 
 
 @pytest.fixture(autouse=True)
-def jira_settings(monkeypatch):
-    monkeypatch.setattr(settings, "jira_email", "mock@example.com")
-    monkeypatch.setattr(settings, "jira_api_token", "mock-jira-token")
-    monkeypatch.setattr(settings, "jira_base_url", "https://mock.atlassian.net")
-    monkeypatch.setattr(settings, "jira_project_key", "SUP")
+def jira_settings():
+    with patch.multiple(
+        settings,
+        jira_email="mock@example.com",
+        jira_api_token="mock-jira-token",
+        jira_base_url="https://mock.atlassian.net",
+        jira_project_key="SUP",
+    ):
+        yield
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tech_llm_cls():
+    """
+    Patch the tech agent's LLM class and RAG lookups once for the module.
+
+    Yields the patched ``AzureChatOpenAI``; ``_make_llm_pair`` points its
+    ``return_value`` at fresh mocks for each test.
+    """
+    with (
+        patch.object(tech_agent, "AzureChatOpenAI") as llm_cls,
+        patch.object(tech_agent.rag, "retrieve_context", return_value=[]),
+        patch.object(tech_agent.rag, "format_context_for_prompt", return_value=""),
+    ):
+        yield llm_cls
 
 
 def _base_state(**overrides) -> dict:
@@ -39,23 +62,18 @@ def _base_state(**overrides) -> dict:
 
 
 def _make_llm_pair(
-    mocker, *, tool_calls=None, final_text="Here is the fix.\nCONFIDENCE: 0.80"
+    llm_cls, *, tool_calls=None, final_text="Here is the fix.\nCONFIDENCE: 0.80"
 ):
-    mock_llm_with_tools = MagicMock()
-    tool_response = MagicMock()
-    tool_response.content = ""
-    tool_response.tool_calls = tool_calls or []
-    mock_llm_with_tools.invoke.return_value = tool_response
-
-    mock_llm = MagicMock()
-    mock_llm.bind_tools.return_value = mock_llm_with_tools
-    final_response = MagicMock()
-    final_response.content = final_text
-    mock_llm.invoke.return_value = final_response
-
-    mocker.patch("agents.tech_agent.AzureChatOpenAI", return_value=mock_llm)
-    mocker.patch("agents.tech_agent.rag.retrieve_context", return_value=[])
-    mocker.patch("agents.tech_agent.rag.format_context_for_prompt", return_value="")
+    # No test asserts on LLM calls, so plain namespaces are enough here.
+    tool_response = SimpleNamespace(content="", tool_calls=tool_calls or [])
+    final_response = SimpleNamespace(content=final_text)
+    mock_llm_with_tools = SimpleNamespace(invoke=lambda *_a, **_k: tool_response)
+    mock_llm = SimpleNamespace(
+        bind_tools=lambda *_a, **_k: mock_llm_with_tools,
+        invoke=lambda *_a, **_k: final_response,
+    )
+
+    llm_cls.return_value = mock_llm
 
     return mock_llm, mock_llm_with_tools
 
@@ -79,11 +97,11 @@ def _mock_httpx_get(mocker, json_body: dict):
 # ---------------------------------------------------------------------------
 
 
-def test_tech_agent_no_tool_calls(mocker):
+def test_tech_agent_no_tool_calls(tech_llm_cls):
     """Agent returns a response with no Jira tool calls needed."""
-    _make_llm_pair(mocker, final_text="Try clearing your cache.\nCONFIDENCE: 0.78")
-
-    from agents.tech_agent import create_tech_agent
+    _make_llm_pair(
+        tech_llm_cls, final_text="Try clearing your cache.\nCONFIDENCE: 0.78"
+    )
 
     agent = create_tech_agent()
     result = agent.invoke(_base_state())
@@ -93,10 +111,10 @@ def test_tech_agent_no_tool_calls(mocker):
     assert result["tool_results"] == []
 
 
-def test_tech_agent_creates_jira_ticket(mocker):
+def test_tech_agent_creates_jira_ticket(mocker, tech_llm_cls):
     """Agent dispatches create_jira_ticket when LLM requests it."""
     _make_llm_pair(
-        mocker,
+        tech_llm_cls,
         tool_calls=[
             {
                 "name": "create_jira_ticket",
@@ -112,8 +130,6 @@ def test_tech_agent_creates_jira_ticket(mocker):
     )
     _mock_httpx_post(mocker, {"key": "SUP-99", "id": "30099"})
 
-    from agents.tech_agent import create_tech_agent
-
     agent = create_tech_agent()
     result = agent.invoke(_base_state())
 
@@ -123,10 +139,10 @@ def test_tech_agent_creates_jira_ticket(mocker):
     assert tr["result"]["key"] == "SUP-99"
 
 
-def test_tech_agent_searches_existing_tickets(mocker):
+def test_tech_agent_searches_existing_tickets(mocker, tech_llm_cls):
     """Agent dispatches search_jira_tickets and returns matching ticket list."""
     _make_llm_pair(
-        mocker,
+        tech_llm_cls,
         tool_calls=[
             {
                 "name": "search_jira_tickets",
@@ -152,8 +168,6 @@ def test_tech_agent_searches_existing_tickets(mocker):
         },
     )
 
-    from agents.tech_agent import create_tech_agent
-
     agent = create_tech_agent()
     result = agent.invoke(_base_state())
 
@@ -161,16 +175,14 @@ def test_tech_agent_searches_existing_tickets(mocker):
     assert result["tool_results"][0]["result"][0]["key"] == "SUP-55"
 
 
-def test_tech_agent_unknown_tool_error(mocker):
+def test_tech_agent_unknown_tool_error(tech_llm_cls):
     """Unknown tool calls are recorded as errors without raising exceptions."""
     _make_llm_pair(
-        mocker,
+        tech_llm_cls,
         tool_calls=[{"name": "hack_the_planet", "args": {}}],
         final_text="Sorry, I can't do that.\nCONFIDENCE: 0.10",
     )
 
-    from agents.tech_agent import create_tech_agent
-
     agent = create_tech_agent()
     result = agent.invoke(_base_state())
 
@@ -178,21 +190,19 @@ def test_tech_agent_unknown_tool_error(mocker):
     assert "Unknown tool" in result["tool_results"][0]["result"]["error"]
 
 
-def test_tech_tool_invoke_raises_error_stored(mocker):
+def test_tech_tool_invoke_raises_error_stored(mocker, tech_llm_cls):
     """When a known tool's invoke() raises, the exception is captured in tool_results."""
     mock_tool = mocker.MagicMock()
     mock_tool.name = "search_jira_tickets"
     mock_tool.invoke.side_effect = Exception("Jira connection refused")
-    mocker.patch("agents.tech_agent.jira_tools", [mock_tool])
+    mocker.patch.object(tech_agent, "jira_tools", [mock_tool])
 
     _make_llm_pair(
-        mocker,
+        tech_llm_cls,
         tool_calls=[{"name": "search_jira_tickets", "args": {"query": "crash"}}],
         final_text="Could not search tickets.\nCONFIDENCE: 0.30",
     )
 
-    from agents.tech_agent import create_tech_agent
-
     agent = create_tech_agent()
     result = agent.invoke(_base_state())
 
@@ -201,11 +211,9 @@ def test_tech_tool_invoke_raises_error_stored(mocker):
     assert "Jira connection refused" in result["tool_results"][0]["result"]["error"]
 
 
-def test_tech_confidence_parse_failure_stays_default(mocker):
+def test_tech_confidence_parse_failure_stays_default(tech_llm_cls):
     """Non-numeric CONFIDENCE value falls back to 0.5 without crashing."""
-    _make_llm_pair(mocker, final_text="Here is the fix.\nCONFIDENCE: uncertain")
-
-    from agents.tech_agent import create_tech_agent
+    _make_llm_pair(tech_llm_cls, final_text="Here is the fix.\nCONFIDENCE: uncertain")
 
     agent = create_tech_agent()
     result = agent.invoke(_base_state())
@@ -32,6 +32,52 @@ def reset_configured():
     tel._configured = False
 
 
+@pytest.fixture
+def configured():
+    """Mark telemetry as configured; ``reset_configured`` clears it again."""
+    tel._configured = True
+
+
+@pytest.fixture(scope="module")
+def _tracer_pair():
+    """(tracer, span) mocks built once; ``tracer_mocks`` resets them per test."""
+    mock_span = MagicMock()
+    mock_span.__enter__ = MagicMock(return_value=mock_span)
+    mock_span.__exit__ = MagicMock(return_value=False)
+    mock_tracer = MagicMock()
+    mock_tracer.start_as_current_span.return_value = mock_span
+    return mock_tracer, mock_span
+
+
+@pytest.fixture
+def tracer_mocks(_tracer_pair):
+    """Patch ``opentelemetry.trace.get_tracer`` to return the shared tracer."""
+    tracer, span = _tracer_pair
+    tracer.reset_mock()
+    span.reset_mock()
+    with patch("opentelemetry.trace.get_tracer", return_value=tracer):
+        yield tracer, span
+
+
+@pytest.fixture(scope="module")
+def _meter_pair():
+    """(meter, gauge) mocks built once; ``meter_mocks`` resets them per test."""
+    mock_gauge = MagicMock()
+    mock_meter = MagicMock()
+    mock_meter.create_gauge.return_value = mock_gauge
+    return mock_meter, mock_gauge
+
+
+@pytest.fixture
+def meter_mocks(_meter_pair):
+    """Patch ``opentelemetry.metrics.get_meter`` to return the shared meter."""
+    meter, gauge = _meter_pair
+    meter.reset_mock()
+    gauge.reset_mock()
+    with patch("opentelemetry.metrics.get_meter", return_value=meter):
+        yield meter, gauge
+
+
 # ---------------------------------------------------------------------------
 # configure_telemetry
 # ---------------------------------------------------------------------------
@@ -93,35 +139,23 @@ def test_track_event_noop_when_not_configured():
     mock_get_tracer.assert_not_called()
 
 
-def test_track_event_emits_span_with_properties_when_configured():
+def test_track_event_emits_span_with_properties_when_configured(
+    configured, tracer_mocks
+):
     """track_event creates a span and sets attribute for each property."""
-    tel._configured = True
-
-    mock_span = MagicMock()
-    mock_span.__enter__ = MagicMock(return_value=mock_span)
-    mock_span.__exit__ = MagicMock(return_value=False)
-    mock_tracer = MagicMock()
-    mock_tracer.start_as_current_span.return_value = mock_span
+    mock_tracer, mock_span = tracer_mocks
 
-    with patch("opentelemetry.trace.get_tracer", return_value=mock_tracer):
-        tel.track_event("conversation.started", {"user_id": "u1"})
+    tel.track_event("conversation.started", {"user_id": "u1"})
 
     mock_tracer.start_as_current_span.assert_called_once_with("conversation.started")
     mock_span.set_attribute.assert_called_once_with("user_id", "u1")
 
 
-def test_track_event_no_properties_when_configured():
+def test_track_event_no_properties_when_configured(configured, tracer_mocks):
     """track_event with no properties creates a span but sets no attributes."""
-    tel._configured = True
+    mock_tracer, mock_span = tracer_mocks
 
-    mock_span = MagicMock()
-    mock_span.__enter__ = MagicMock(return_value=mock_span)
-    mock_span.__exit__ = MagicMock(return_value=False)
-    mock_tracer = MagicMock()
-    mock_tracer.start_as_current_span.return_value = mock_span
-
-    with patch("opentelemetry.trace.get_tracer", return_value=mock_tracer):
-        tel.track_event("simple.event")
+    tel.track_event("simple.event")
 
     mock_tracer.start_as_current_span.assert_called_once_with("simple.event")
     mock_span.set_attribute.assert_not_called()
@@ -140,16 +174,13 @@ def test_track_metric_noop_when_not_configured():
     mock_get_meter.assert_not_called()
 
 
-def test_track_metric_records_value_and_attributes_when_configured():
+def test_track_metric_records_value_and_attributes_when_configured(
+    configured, meter_mocks
+):
     """track_metric calls gauge.set with the correct value and attributes."""
-    tel._configured = True
-
-    mock_gauge = MagicMock()
-    mock_meter = MagicMock()
-    mock_meter.create_gauge.return_value = mock_gauge
+    mock_meter, mock_gauge = meter_mocks
 
-    with patch("opentelemetry.metrics.get_meter", return_value=mock_meter):
-        tel.track_metric("latency_ms", 123.4, {"endpoint": "/api/health"})
+    tel.track_metric("latency_ms", 123.4, {"endpoint": "/api/health"})
 
     mock_meter.create_gauge.assert_called_once_with("latency_ms")
     mock_gauge.set.assert_called_once_with(
@@ -157,16 +188,13 @@ def test_track_metric_records_value_and_attributes_when_configured():
     )
 
 
-def test_track_metric_empty_attributes_when_no_properties_given():
+def test_track_metric_empty_attributes_when_no_properties_given(
+    configured, meter_mocks
+):
     """track_metric passes an empty dict as attributes when no properties supplied."""
-    tel._configured = True
-
-    mock_gauge = MagicMock()
-    mock_meter = MagicMock()
-    mock_meter.create_gauge.return_value = mock_gauge
+    mock_meter, mock_gauge = meter_mocks
 
-    with patch("opentelemetry.metrics.get_meter", return_value=mock_meter):
-        tel.track_metric("counter", 1.0)
+    tel.track_metric("counter", 1.0)
 
     mock_gauge.set.assert_called_once_with(1.0, attributes={})
 
@@ -209,27 +237,24 @@ def test_get_logger_defaults_to_info_when_env_absent(monkeypatch):
 # ---------------------------------------------------------------------------
 
 
-def test_timer_emits_metric_on_context_exit():
+def test_timer_emits_metric_on_context_exit(configured, meter_mocks):
     """Timer calls track_metric with elapsed_ms >= 0 when context exits."""
-    tel._configured = True
+    mock_meter, mock_gauge = meter_mocks
 
-    mock_gauge = MagicMock()
-    mock_meter = MagicMock()
-    mock_meter.create_gauge.return_value = mock_gauge
-
-    with patch("opentelemetry.metrics.get_meter", return_value=mock_meter):
-        with tel.Timer("db.query_ms", {"table": "conversations"}):
-            pass  # virtually instant
+    with tel.Timer("db.query_ms", {"table": "conversations"}):
+        pass  # virtually instant
 
     mock_meter.create_gauge.assert_called_once_with("db.query_ms")
     recorded_value = mock_gauge.set.call_args[0][0]
     assert recorded_value >= 0
 
 
-def test_timer_elapsed_is_positive_after_real_sleep():
-    """Timer measures real elapsed time (>= 10 ms after a 10 ms sleep)."""
-    tel._configured = True
-
+def test_timer_reports_elapsed_milliseconds(configured, monkeypatch):
+    """Timer reports the monotonic-clock delta in milliseconds."""
+    # Wrap the real module so only monotonic() is faked for telemetry.
+    fake_time = MagicMock(wraps=time)
+    fake_time.monotonic.side_effect = [100.0, 100.015]
+    monkeypatch.setattr(tel, "time", fake_time)
     recorded: list = []
 
     def capture_metric(name, value, properties=None):
@@ -237,7 +262,7 @@ def test_timer_elapsed_is_positive_after_real_sleep():
 
     with patch.object(tel, "track_metric", side_effect=capture_metric):
         with tel.Timer("sleep_ms"):
-            time.sleep(0.01)
+            pass
 
     assert len(recorded) == 1
-    assert recorded[0] >= 10  # 10 ms sleep → at least 10 ms elapsed
+    assert recorded[0] == pytest.approx(15.0)